@@ -1,87 +1,290 @@
-import sys
-import nltk
-import ssl
-import re
-from bs4 import BeautifulSoup
-import requests
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
-from collections import Counter
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from flask import Flask, render_template, request
+import os
+import json
+import heapq
+import itertools
+import time
+import threading
+from collections import Counter, defaultdict
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Flask, render_template, request, jsonify, Response, g, has_request_context
+from nlp_resources import resources
+from fetcher import fetcher
+from extractors import get_extractor
+from streaming import ParagraphStream, response_charset
+from normalize import preprocess_tokens
+from result_cache import analysis_cache, normalize_url, hash_text, CacheEntry
+from sentiment import SentimentScorer
+from singleflight import SingleFlight
+from article_store import ArticleStore
+from admission import AdmissionController, RateLimiter, Overloaded, RateLimited
+from compression import compress_response
+from metrics import metrics, span, server_timing_header, request_seconds, requests_total, article_words, article_chars
 
 # Set up Flask
 app = Flask(__name__)
 
-# Function to download NLTK data
-def download_nltk_data():
-    try:
-        nltk.data.find('tokenizers/punkt')
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        print("NLTK data not found. Attempting to download...")
-        try:
-            # Try to create an unverified HTTPS context
-            try:
-                _create_unverified_https_context = ssl._create_unverified_context
-            except AttributeError:
-                pass
-            else:
-                ssl._create_default_https_context = _create_unverified_https_context
-            
-            nltk.download('punkt')
-            nltk.download('stopwords')
-            print("NLTK data downloaded successfully.")
-        except Exception as e:
-            print(f"Failed to download NLTK data: {e}")
-            print("Please download the required NLTK data manually.")
-            sys.exit(1)
-
-# Download NLTK data
-download_nltk_data()
-
-# Function to scrape article text from a URL
-def get_article_text(url):
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
-    article_text = ""
-    for p in soup.find_all('p'):
-        article_text += p.get_text() + " "
-    return article_text
-
-# Preprocess the text
-def preprocess_text(text):
-    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
-    text = text.lower()
-    tokens = word_tokenize(text)
-    stop_words = set(stopwords.words('english'))
-    filtered_tokens = [w for w in tokens if not w in stop_words]
-    return " ".join(filtered_tokens)
+# Summary settings: how many top words select sentences, and the sentence budget (None keeps every match)
+SUMMARY_TOP_WORDS = 10
+SUMMARY_MAX_SENTENCES = None
+
+# Pages larger than this, on the wire or once decompressed (or without a Content-Length), are streamed paragraph by
+# paragraph instead of parsed whole;
+# streaming stops reading after MAX_PAGE_BYTES
+STREAMING_THRESHOLD_BYTES = 2 * 1024 * 1024
+MAX_PAGE_BYTES = 64 * 1024 * 1024
+
+# Sentiment is scored per sentence; with SENTIMENT_WORKERS > 0 long articles are scored on a process pool
+SENTIMENT_WORKERS = int(os.environ.get('SENTIMENT_WORKERS', 0))
+sentiment_scorer = SentimentScorer(workers=SENTIMENT_WORKERS)
+
+# Add a Server-Timing header with per-stage durations to every analysis response
+SERVER_TIMING = os.environ.get('SERVER_TIMING') == '1'
+
+# Batch analysis settings; batches are refused while more than BATCH_MAX_PENDING URLs are still queued
+BATCH_MAX_URLS = 500
+BATCH_WORKERS = 16
+BATCH_MAX_PENDING = 2000
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS)
+batch_pending = 0
+batch_pending_lock = threading.Lock()
+
+# Admission control: analyses running at once, requests allowed to wait for a slot, and how long they wait
+ANALYZE_MAX_CONCURRENT = int(os.environ.get('ANALYZE_MAX_CONCURRENT', 2 * (os.cpu_count() or 1)))
+ANALYZE_MAX_QUEUE = int(os.environ.get('ANALYZE_MAX_QUEUE', 32))
+ANALYZE_QUEUE_TIMEOUT = float(os.environ.get('ANALYZE_QUEUE_TIMEOUT', 10))
+admission = AdmissionController(ANALYZE_MAX_CONCURRENT, ANALYZE_MAX_QUEUE, ANALYZE_QUEUE_TIMEOUT)
+
+# Per-client rate limit in analyses per minute (0 disables it), with bursts of up to RATE_LIMIT_BURST.
+# A batch is charged one token per URL; a batch larger than the burst needs a full bucket and leaves it in debt.
+# With TRUST_PROXY=1 the client is taken from X-Forwarded-For.
+RATE_LIMIT_PER_MINUTE = float(os.environ.get('RATE_LIMIT_PER_MINUTE', 60))
+RATE_LIMIT_BURST = int(os.environ.get('RATE_LIMIT_BURST', 20))
+TRUST_PROXY = os.environ.get('TRUST_PROXY') == '1'
+rate_limiter = RateLimiter(RATE_LIMIT_PER_MINUTE / 60, RATE_LIMIT_BURST)
+
+# Persistent SQLite article store so analyses survive restarts; set ARTICLE_STORE to an empty string to disable it
+ARTICLE_STORE = os.environ.get('ARTICLE_STORE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'article_store.sqlite3'))
+article_store = ArticleStore(ARTICLE_STORE) if ARTICLE_STORE else None
+
+# Concurrent requests for the same normalized URL share one fetch-and-analyze
+inflight = SingleFlight()
+
+# Time a pipeline stage; inside a request the duration is also kept for the Server-Timing header
+def stage(name):
+    timings = g.setdefault('timings', []) if has_request_context() else None
+    return span(name, timings)
+
+# HTML backend used to pull <p> text out of pages (html.parser, lxml or selectolax; default is the fastest installed)
+extract_article_text = get_extractor(os.environ.get('HTML_EXTRACTOR'))
+
+# Tokenized view of an article, built in a single tokenizer pass and shared by every analysis stage.
+# Paragraphs can be added one at a time, so a streamed page never needs its raw HTML in memory.
+class ArticleDocument:
+    def __init__(self, text=""):
+        self.paragraphs = []
+        self.sentences = []
+        self.sentence_tokens = []
+        self.sentence_filtered_tokens = []
+        self.word_counts = Counter()
+        self.total_words = 0
+        self.truncated = False
+        if text:
+            self.add_paragraph(text)
+
+    # Build a document from an iterable of paragraph texts
+    @classmethod
+    def from_paragraphs(cls, paragraphs):
+        doc = cls()
+        for paragraph in paragraphs:
+            doc.add_paragraph(paragraph)
+        return doc
+
+    def add_paragraph(self, text):
+        sent_tokenize, word_tokenize = resources.get('tokenizers')
+        stop_words = resources.get('stop_words')
+        self.paragraphs.append(text)
+        for sentence in sent_tokenize(text):
+            tokens = word_tokenize(sentence, preserve_line=True)
+            filtered_tokens = preprocess_tokens(tokens, stop_words)
+            self.sentences.append(sentence)
+            self.sentence_tokens.append(tokens)
+            self.sentence_filtered_tokens.append(filtered_tokens)
+            self.word_counts.update(filtered_tokens)
+            self.total_words += len(tokens)
+
+    @property
+    def text(self):
+        return " ".join(self.paragraphs)
+
+    @property
+    def tokens(self):
+        return [token for tokens in self.sentence_tokens for token in tokens]
+
+    @property
+    def filtered_tokens(self):
+        return [token for tokens in self.sentence_filtered_tokens for token in tokens]
+
+    # Inverted index: filtered token -> indices of the sentences containing it
+    @cached_property
+    def sentence_index(self):
+        index = defaultdict(list)
+        for i, tokens in enumerate(self.sentence_filtered_tokens):
+            for token in set(tokens):
+                index[token].append(i)
+        return index
 
 # Analyze article: word frequency and sentiment analysis
-def analyze_article(text):
-    tokens = word_tokenize(text)
-    word_counts = Counter(tokens)
-    top_words = word_counts.most_common(10)
+def analyze_article(doc):
+    top_words = doc.word_counts.most_common(10)
 
-    analyzer = SentimentIntensityAnalyzer()
-    sentiment_scores = analyzer.polarity_scores(text)
+    # VADER is built for sentence-sized input: score each sentence and aggregate, weighted by sentence length
+    weights = [len(tokens) for tokens in doc.sentence_tokens]
+    sentiment_scores, distribution = sentiment_scorer.score(doc.sentences, weights)
 
     return {
         "top_words": top_words,
-        "sentiment": sentiment_scores
+        "sentiment": sentiment_scores,
+        "sentiment_distribution": distribution
     }
 
-# Summarize the article
-def summarize_text(article_text):
-    sentences = sent_tokenize(article_text)
-    processed_text = preprocess_text(article_text)
-    word_tokens = word_tokenize(processed_text)
-    word_freq = Counter(word_tokens)
-    top_words = [word for word, freq in word_freq.most_common(10)]
-    summary_sentences = [sentence for sentence in sentences if any(word in sentence.lower() for word in top_words)]
-    summary = " ".join(summary_sentences)
-    return summary
+# Summarize the article, returning the summary and its word count.
+# Sentences are scored through the inverted index by the frequency of the top words they contain;
+# the highest-scoring max_sentences are kept in their original order.
+def summarize_text(doc, top_n=SUMMARY_TOP_WORDS, max_sentences=SUMMARY_MAX_SENTENCES):
+    scores = defaultdict(int)
+    for word, freq in doc.word_counts.most_common(top_n):
+        for i in doc.sentence_index[word]:
+            scores[i] += freq
+
+    if max_sentences is None or len(scores) <= max_sentences:
+        selected = sorted(scores)
+    else:
+        selected = sorted(heapq.nlargest(max_sentences, scores, key=lambda i: (scores[i], -i)))
+
+    summary = " ".join(doc.sentences[i] for i in selected)
+    summary_word_count = sum(len(doc.sentence_tokens[i]) for i in selected)
+    return summary, summary_word_count
+
+# Run the full analysis pipeline over an article document
+def run_pipeline(doc):
+    with stage('analyze_article'):
+        analysis = analyze_article(doc)
+    with stage('summarize_text'):
+        summary, total_words_summary = summarize_text(doc)
+    return {
+        "summary": summary,
+        "top_words": analysis['top_words'],
+        "sentiment": analysis['sentiment'],
+        "sentiment_distribution": analysis['sentiment_distribution'],
+        "total_words_full": doc.total_words,
+        "total_words_summary": total_words_summary,
+        "truncated": doc.truncated
+    }
+
+# Function to read the Content-Length of a response; None when it is missing or malformed
+def content_length(response):
+    try:
+        return int(response.headers['Content-Length'])
+    except (KeyError, ValueError):
+        return None
+
+# Function to read body chunks until more than max_bytes have arrived; returns (chunks read, whether the body ended)
+def read_chunks(chunks, max_bytes):
+    body = []
+    size = 0
+    for chunk in chunks:
+        body.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            return body, False
+    return body, True
+
+# Build the article document from an open response: small pages go through the fast extractor,
+# large or unsized pages are streamed into the document paragraph by paragraph.
+# Content-Length is the size on the wire, so a compressed page can still inflate past the threshold; the small
+# path reads the decoded body only up to STREAMING_THRESHOLD_BYTES and hands anything larger to the stream.
+def load_article(response):
+    chunks = response.iter_content(fetcher.chunk_size)
+    length = content_length(response)
+    if length is not None and 0 <= length <= STREAMING_THRESHOLD_BYTES:
+        with stage('download'):
+            body, complete = read_chunks(chunks, STREAMING_THRESHOLD_BYTES)
+        if complete:
+            with stage('extract'):
+                article_text = extract_article_text(b"".join(body), response_charset(response, default=None))
+            with stage('tokenize'):
+                return ArticleDocument(article_text)
+        chunks = itertools.chain(body, chunks)
+    # Download, extraction and tokenization are interleaved when streaming
+    with stage('stream_ingest'):
+        stream = ParagraphStream(chunks, response_charset(response), MAX_PAGE_BYTES)
+        doc = ArticleDocument.from_paragraphs(stream)
+        doc.truncated = stream.truncated
+    return doc
+
+# Fetch and analyze a single URL, serving repeats from the result cache; returns (article_text, result).
+# Cache hits are answered at once. Otherwise concurrent requests for the same URL are coalesced, and the one
+# request that does the work takes an admission slot for the network and NLP pipeline.
+def analyze_url(url, bounded_wait=True):
+    key = normalize_url(url)
+    entry, fresh = analysis_cache.lookup(key)
+    if entry is None and article_store is not None:
+        entry, fresh = load_stored_entry(key)
+    if fresh:
+        return entry.article_text, entry.result
+    return inflight.do(key, admitted_fetch_and_analyze, url, key, entry, bounded_wait)
+
+# Warm the result cache from the article store after a restart
+def load_stored_entry(key):
+    stored = article_store.load_url(key)
+    if stored is None:
+        return None, False
+    article_text, result, content_hash, etag, last_modified, age = stored
+    entry = CacheEntry(article_text, result, content_hash, etag, last_modified, age=age)
+    analysis_cache.put(key, entry)
+    return entry, age < analysis_cache.ttl
+
+def admitted_fetch_and_analyze(url, key, entry, bounded_wait):
+    with admission.slot(bounded=bounded_wait):
+        return fetch_and_analyze(url, key, entry)
+
+def fetch_and_analyze(url, key, entry):
+    # Stale or missing: revalidate with the origin before re-analyzing
+    with stage('fetch'):
+        if entry is not None:
+            response = fetcher.open_page(url, etag=entry.etag, last_modified=entry.last_modified)
+        else:
+            response = fetcher.open_page(url)
+    with response:
+        if response.status_code == 304:
+            analysis_cache.revalidate(entry)
+            if article_store is not None:
+                article_store.touch_url(key)
+            return entry.article_text, entry.result
+        doc = load_article(response)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+
+    article_text = doc.text
+    content_hash = hash_text(article_text)
+    # Reuse an existing analysis when the text is unchanged, or already stored under another URL
+    result = None
+    if entry is not None and entry.content_hash == content_hash:
+        result = entry.result
+        analysis_cache.record_unchanged()
+    elif article_store is not None:
+        result = article_store.load_result(content_hash)
+    if result is None:
+        result = run_pipeline(doc)
+        article_words.observe(doc.total_words)
+        article_chars.observe(len(article_text))
+        if article_store is not None:
+            article_store.save(key, content_hash, article_text, doc.sentence_tokens, result, etag, last_modified)
+    elif article_store is not None:
+        article_store.save_url(key, content_hash, etag, last_modified)
+    analysis_cache.put(key, CacheEntry(article_text, result, content_hash, etag, last_modified))
+    return article_text, result
 
 # Flask route for home page
 @app.route('/')
@@ -91,32 +294,205 @@ def home():
 # Flask route to handle article analysis
 @app.route('/analyze', methods=['POST'])
 def analyze():
-    url = request.form['url']
+    rate_limiter.check(client_id())
+    payload = json_payload()
+    url = payload.get('url') or request.form.get('url')
+    as_json = wants_json(payload)
+    if not url:
+        if as_json:
+            return jsonify(error="Missing 'url'."), 400
+        return render_template('error.html', error="An error occurred: no URL was given."), 400
     try:
         # Get article, preprocess, and analyze
-        article_text = get_article_text(url)
+        article_text, result = analyze_url(url)
         # article_text = "Kansas City's Erik Thommy equalised to take the game to extra time, when Mexican defender Omar Campos and Sierra Leonean forward Kei Kamara scored to seal the win. For Giroud, who retired from France duty in July as the nation's record scorer with 57 goals, it was important after August's Leagues Cup final defeat by Columbus Crew."
-        processed_text = preprocess_text(article_text)
-        analysis = analyze_article(processed_text)
-        summary = summarize_text(article_text)
-
-        # Total word counts
-        total_words_full = len(word_tokenize(article_text))
-        total_words_summary = len(word_tokenize(summary))
-
-        return render_template('result.html', 
-                               article_text=article_text,
-                               summary=summary,
-                               top_words=analysis['top_words'],
-                               sentiment=analysis['sentiment'],
-                               total_words_full=total_words_full,
-                               total_words_summary=total_words_summary)
 
+        if as_json:
+            with stage('serialize'):
+                body = {"url": url, **result}
+                if is_truthy(payload.get('include_text', request.args.get('include_text'))):
+                    body["article_text"] = article_text
+                return jsonify(body)
+
+        with stage('render'):
+            return render_template('result.html', article_text=article_text, **result)
+
+    except Overloaded:
+        raise
     except Exception as e:
         error_message = f"An error occurred: {str(e)}"
-        print(error_message)  # This will print to the console for debugging
+        g.outcome = 'error'
+        app.logger.exception(error_message)
+        if as_json:
+            # requests' exceptions are OSErrors: report fetch failures as a bad gateway
+            return jsonify(error=error_message), 502 if isinstance(e, OSError) else 500
         return render_template('error.html', error=error_message)
 
-# Run Flask app
+# JSON is returned to JSON request bodies, format=json, or clients that prefer application/json over HTML
+def wants_json(payload):
+    requested_format = payload.get('format') or request.values.get('format')
+    if request.is_json or requested_format == 'json':
+        return True
+    best = request.accept_mimetypes.best_match(['text/html', 'application/json'])
+    return best == 'application/json' and request.accept_mimetypes[best] > request.accept_mimetypes['text/html']
+
+def is_truthy(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+# Function to read the request's JSON body; {} when it is missing, malformed or not a JSON object
+def json_payload():
+    payload = request.get_json(silent=True)
+    return payload if isinstance(payload, dict) else {}
+
+# Flask route to analyze many URLs at once, streaming one NDJSON line per article as each finishes
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    payload = json_payload()
+    urls = payload.get('urls')
+    if not isinstance(urls, list) or not urls or not all(isinstance(url, str) for url in urls):
+        return jsonify(error="Expected a JSON body with a non-empty 'urls' list of strings."), 400
+    if len(urls) > BATCH_MAX_URLS:
+        return jsonify(error=f"At most {BATCH_MAX_URLS} URLs can be analyzed per batch."), 413
+    rate_limiter.check(client_id(), cost=len(urls))
+    reserve_batch(len(urls))
+
+    # Batch jobs are already bounded by the worker pool, so they wait for admission slots without the queue limit
+    futures = {}
+    for url in urls:
+        future = batch_executor.submit(analyze_url, url, bounded_wait=False)
+        future.add_done_callback(release_batch_job)
+        futures[future] = url
+
+    def generate():
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                article_text, result = future.result()
+                record = {"url": url, "ok": True, **result}
+            except Exception as e:
+                record = {"url": url, "ok": False, "error": str(e)}
+            yield json.dumps(record) + "\n"
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+# Function to identify the client for rate limiting
+def client_id():
+    if TRUST_PROXY and request.access_route:
+        return request.access_route[0]
+    return request.remote_addr or 'unknown'
+
+# Count queued batch jobs, refusing a batch that would push the backlog past BATCH_MAX_PENDING
+def reserve_batch(size):
+    global batch_pending
+    with batch_pending_lock:
+        if batch_pending + size > BATCH_MAX_PENDING:
+            raise Overloaded("Server is busy: too many batch URLs are queued.", admission.retry_after)
+        batch_pending += size
+
+def release_batch_job(future):
+    global batch_pending
+    with batch_pending_lock:
+        batch_pending -= 1
+
+# Overload and rate-limit responses, in the format the client asked for
+@app.errorhandler(Overloaded)
+def handle_overloaded(e):
+    g.outcome = 'rejected'
+    return rejection_response(e, 503)
+
+@app.errorhandler(RateLimited)
+def handle_rate_limited(e):
+    g.outcome = 'rate_limited'
+    return rejection_response(e, 429)
+
+def rejection_response(e, status):
+    if request.endpoint == 'analyze_batch' or wants_json(json_payload()):
+        response = jsonify(error=str(e))
+    else:
+        response = app.make_response(render_template('error.html', error=str(e)))
+    response.status_code = status
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response
+
+# Record latency and outcome of analysis requests, and attach Server-Timing when enabled
+ANALYSIS_ENDPOINTS = ('analyze', 'analyze_batch')
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    if request.endpoint in ANALYSIS_ENDPOINTS:
+        elapsed = time.perf_counter() - g.request_start
+        response.vary.add('Accept')
+        request_seconds.observe(elapsed, route=request.endpoint)
+        requests_total.inc(route=request.endpoint, outcome=g.get('outcome', 'ok'))
+        if SERVER_TIMING:
+            timings = g.get('timings', []) + [('total', elapsed)]
+            response.headers['Server-Timing'] = server_timing_header(timings)
+    return response
+
+# gzip/brotli-compress buffered text and JSON responses for clients that accept it
+@app.after_request
+def compress(response):
+    return compress_response(request, response)
+
+# Prometheus scrape endpoint
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# Readiness probe: 200 once every NLP resource is loaded, 503 before that
+@app.route('/ready')
+def ready():
+    if resources.ready():
+        return jsonify(ready=True)
+    return jsonify(ready=False, resources=resources.stats()), 503
+
+# Flask route exposing load times and hit counts of the shared NLP resources
+@app.route('/resources')
+def resource_stats():
+    return jsonify(resources.stats())
+
+# Flask route exposing hit/miss/eviction counters of the analysis result cache
+@app.route('/cache')
+def cache_stats():
+    return jsonify(analysis_cache.stats())
+
+# Export cache and NLP resource counters as gauges at scrape time
+def cache_and_resource_gauges():
+    gauges = {}
+    for name, value in analysis_cache.stats().items():
+        gauges[(f"news_cache_{name}", ())] = value
+    for name, value in admission.stats().items():
+        gauges[(f"news_admission_{name}", ())] = value
+    for name, value in inflight.stats().items():
+        gauges[(f"news_singleflight_{name}", ())] = value
+    gauges[("news_batch_pending", ())] = batch_pending
+    if article_store is not None:
+        for name, value in article_store.stats().items():
+            gauges[(f"news_store_{name}", ())] = value
+    gauges[("news_rate_limited", ())] = rate_limiter.stats()["limited"]
+    for name, stats in resources.stats().items():
+        if name == 'warmup':
+            continue
+        labels = (('resource', name),)
+        gauges[("news_resource_loaded", labels)] = int(stats["loaded"])
+        gauges[("news_resource_load_seconds", labels)] = stats["load_seconds"]
+        gauges[("news_resource_hits", labels)] = stats["hits"]
+    return gauges
+
+metrics.gauges(cache_and_resource_gauges)
+
+# Application factory. WARMUP_MODE picks how NLTK data, stopwords and the VADER lexicon are loaded:
+# 'eager' (default) loads them before returning, so a preloading server shares them copy-on-write with its
+# forked workers; 'background' returns immediately and loads them on a thread; 'lazy' loads each on first use.
+def create_app(warmup_mode=None):
+    resources.start(warmup_mode or os.environ.get('WARMUP_MODE', 'eager'))
+    return app
+
+# Run Flask app (development server; see wsgi.py for production serving)
 if __name__ == "__main__":
+    create_app()
     app.run(debug=True)
\ No newline at end of file
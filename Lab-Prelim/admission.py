@@ -0,0 +1,104 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Raised when the server is at capacity; carries the Retry-After hint in seconds
+class Overloaded(Exception):
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+# Raised when a client exceeds its request rate
+class RateLimited(Exception):
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+# Bounded work queue: at most max_concurrent analyses run at once, at most max_queue wait for a slot,
+# and a waiter gives up after queue_timeout seconds
+class AdmissionController:
+    def __init__(self, max_concurrent, max_queue, queue_timeout, retry_after=5):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._condition = threading.Condition()
+
+    # Hold a processing slot for the duration of the block. bounded=False waits without the queue-depth
+    # limit or timeout, for callers that are already bounded elsewhere (e.g. batch worker threads).
+    @contextmanager
+    def slot(self, bounded=True):
+        self._acquire(bounded)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.active -= 1
+                self._condition.notify()
+
+    def _acquire(self, bounded):
+        with self._condition:
+            if self.active < self.max_concurrent and not self.waiting:
+                self.active += 1
+                return
+            if bounded and self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise Overloaded("Server is busy: the analysis queue is full.", self.retry_after)
+            self.waiting += 1
+            try:
+                deadline = time.monotonic() + self.queue_timeout if bounded else None
+                while self.active >= self.max_concurrent:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self.timed_out += 1
+                        raise Overloaded("Server is busy: timed out waiting for an analysis slot.", self.retry_after)
+                    self._condition.wait(remaining)
+                self.active += 1
+            finally:
+                self.waiting -= 1
+
+    def stats(self):
+        with self._condition:
+            return {"active": self.active, "waiting": self.waiting, "max_concurrent": self.max_concurrent,
+                    "max_queue": self.max_queue, "rejected": self.rejected, "timed_out": self.timed_out}
+
+# Per-client token bucket: `rate` requests per second on average with bursts of up to `burst`.
+# A request costing more than `burst` (a large batch) is admitted once the bucket is full and leaves it in
+# debt, so the client's later requests wait until the full cost has been paid back.
+class RateLimiter:
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.limited = 0
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Take `cost` tokens from the client's bucket or raise RateLimited
+    def check(self, client, cost=1):
+        if self.rate <= 0:
+            return
+        required = min(cost, self.burst)
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < required:
+                self._buckets[client] = (tokens, now)
+                self.limited += 1
+                retry_after = math.ceil((required - tokens) / self.rate)
+                raise RateLimited("Too many requests: slow down.", retry_after)
+            self._buckets[client] = (tokens - cost, now)
+            # Forget the least recently seen clients
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"clients": len(self._buckets), "limited": self.limited}
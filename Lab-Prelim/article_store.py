@@ -0,0 +1,129 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    content_hash TEXT PRIMARY KEY,
+    article_text BLOB NOT NULL,
+    tokens BLOB,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL REFERENCES articles(content_hash),
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_content_hash ON urls(content_hash);
+"""
+
+def pack(value):
+    return zlib.compress(value.encode('utf-8'))
+
+def unpack(blob):
+    return zlib.decompress(blob).decode('utf-8')
+
+# Persistent article store in SQLite. Articles are content-addressed by the hash of their text, so the same
+# article syndicated under several URLs is stored and analyzed once; urls maps each normalized URL to its
+# current content hash and HTTP validators.
+class ArticleStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Connections a forked child inherited; kept referenced, since closing them could drop the parent's locks
+        self._inherited = []
+        self.stats_counters = {"url_hits": 0, "content_hits": 0, "articles_saved": 0}
+        # The schema is created on a throwaway connection: the store is built at import time, which under
+        # gunicorn's preload_app happens in the master, and SQLite connections must not cross fork()
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+
+    # One connection per thread, opened on first use in that thread (and again in a forked child);
+    # WAL lets readers proceed while a writer commits
+    def _connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            if connection is not None:
+                self._inherited.append(connection)
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, name):
+        with self._lock:
+            self.stats_counters[name] += 1
+
+    # Look up a URL; returns (article_text, result, content_hash, etag, last_modified, age in seconds) or None
+    def load_url(self, url):
+        row = self._connect().execute(
+            "SELECT a.article_text, a.result, u.content_hash, u.etag, u.last_modified, u.fetched_at "
+            "FROM urls u JOIN articles a ON a.content_hash = u.content_hash WHERE u.url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        self._count("url_hits")
+        article_text, result, content_hash, etag, last_modified, fetched_at = row
+        return unpack(article_text), json.loads(result), content_hash, etag, last_modified, time.time() - fetched_at
+
+    # Return the stored analysis for a content hash, or None
+    def load_result(self, content_hash):
+        row = self._connect().execute("SELECT result FROM articles WHERE content_hash = ?", (content_hash,)).fetchone()
+        if row is None:
+            return None
+        self._count("content_hits")
+        return json.loads(row[0])
+
+    # Save an analyzed article (text, per-sentence tokens and result) and point the URL at it
+    def save(self, url, content_hash, article_text, tokens, result, etag=None, last_modified=None):
+        now = time.time()
+        connection = self._connect()
+        with connection:
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO articles (content_hash, article_text, tokens, result, created_at) VALUES (?, ?, ?, ?, ?)",
+                (content_hash, pack(article_text), pack(json.dumps(tokens)) if tokens is not None else None,
+                 json.dumps(result), now))
+            self._save_url(connection, url, content_hash, etag, last_modified, now)
+        if cursor.rowcount:
+            self._count("articles_saved")
+
+    # Point a URL at an already-stored article
+    def save_url(self, url, content_hash, etag=None, last_modified=None):
+        connection = self._connect()
+        with connection:
+            self._save_url(connection, url, content_hash, etag, last_modified, time.time())
+
+    def _save_url(self, connection, url, content_hash, etag, last_modified, fetched_at):
+        connection.execute(
+            "INSERT INTO urls (url, content_hash, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET content_hash = excluded.content_hash, etag = excluded.etag, "
+            "last_modified = excluded.last_modified, fetched_at = excluded.fetched_at",
+            (url, content_hash, etag, last_modified, fetched_at))
+
+    # Record a successful revalidation (304) so the URL counts as fresh after a restart
+    def touch_url(self, url):
+        connection = self._connect()
+        with connection:
+            connection.execute("UPDATE urls SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def stats(self):
+        connection = self._connect()
+        articles = connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        urls = connection.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+        with self._lock:
+            stats = dict(self.stats_counters)
+        stats.update(articles=articles, urls=urls)
+        return stats
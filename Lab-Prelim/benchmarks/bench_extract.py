@@ -0,0 +1,92 @@
+# Benchmark: HTML paragraph extraction on multi-megabyte pages
+# Usage: python benchmarks/bench_extract.py [--sizes 1 4 16] [--repeat 3]
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bs4 import BeautifulSoup
+from extractors import available_extractors, get_extractor
+
+WORDS = ("market rally tech earnings growth inflation storm vaccine energy solar panel team "
+         "championship victory research policy election city council weather report").split()
+
+# Function to build a synthetic news page of roughly size_mb megabytes, with navigation noise between paragraphs
+def make_page(size_mb, seed=42):
+    rng = random.Random(seed)
+    parts = ["<html><head><title>Bench</title><script>var x = 1;</script></head><body>"]
+    size = 0
+    target = int(size_mb * 1024 * 1024)
+    while size < target:
+        paragraph = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))) + "."
+        chunk = (f'<div class="nav"><a href="/x">link</a><span>menu</span></div>'
+                 f'<p>{paragraph} <b>{rng.choice(WORDS)}</b> <a href="/y">{rng.choice(WORDS)}</a></p>')
+        parts.append(chunk)
+        size += len(chunk)
+    parts.append("</body></html>")
+    return "".join(parts).encode('utf-8')
+
+# The original get_article_text extraction: full html.parser DOM plus string concatenation
+def extract_legacy(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    article_text = ""
+    for p in soup.find_all('p'):
+        article_text += p.get_text() + " "
+    return article_text
+
+def get_backend(name):
+    return extract_legacy if name == 'legacy' else get_extractor(name)
+
+# Run one backend in a fresh process so peak RSS is not polluted by earlier runs
+def run_backend(name, content, repeat, queue):
+    extract = get_backend(name)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = extract(content)
+        timings.append(time.perf_counter() - start)
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+
+    # Python-heap peak for a single run (C allocations in lxml/selectolax are not traced)
+    tracemalloc.start()
+    extract(content)
+    heap_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    queue.put((min(timings), rss_kb, heap_peak, len(text)))
+
+def measure(name, content, repeat):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=run_backend, args=(name, content, repeat, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML paragraph extraction backends")
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 4, 16], help="page sizes in MB")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--backends', nargs='+', default=['legacy'] + available_extractors())
+    args = parser.parse_args()
+
+    print(f"{'size':>7} {'backend':<12} {'best time':>10} {'speedup':>8} {'peak RSS':>10} {'py heap':>10} {'chars':>10}")
+    for size_mb in args.sizes:
+        content = make_page(size_mb)
+        legacy_time = None
+        for name in args.backends:
+            best, rss_kb, heap_peak, chars = measure(name, content, args.repeat)
+            if name == 'legacy':
+                legacy_time = best
+            speedup = f"{legacy_time / best:.1f}x" if legacy_time else "-"
+            print(f"{size_mb:>5.1f}MB {name:<12} {best * 1000:>8.1f}ms {speedup:>8} "
+                  f"{rss_kb / 1024:>8.1f}MB {heap_peak / 1024 / 1024:>8.1f}MB {chars:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# Load test for the /analyze service, fully offline.
+# Starts a local stub news server with fixture pages of several sizes, launches the app in a subprocess
+# (threaded werkzeug or gunicorn), drives /analyze at the given concurrency and reports throughput,
+# latency percentiles and the server's peak RSS.
+# Usage: python benchmarks/bench_load.py [--server werkzeug|gunicorn] [--concurrency 8] [--requests 200]
+#                                        [--sizes-kb 10 100 1000] [--repeat-urls] [--max-p99 SECONDS]
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, APP_DIR)
+
+import requests
+from stub_server import start_stub_server
+from bench_extract import make_page
+
+WERKZEUG_SERVER = """
+import sys
+from werkzeug.serving import run_simple
+import News_Scraper
+run_simple('127.0.0.1', int(sys.argv[1]), News_Scraper.create_app(), threaded=True)
+"""
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+# Launch the app; the store and rate limiter are disabled so runs are repeatable
+def start_app(server, port, workers):
+    env = dict(os.environ, ARTICLE_STORE='', RATE_LIMIT_PER_MINUTE='0', WARMUP_MODE='eager')
+    if server == 'gunicorn':
+        env.update(BIND=f'127.0.0.1:{port}', WEB_CONCURRENCY=str(workers))
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py']
+    else:
+        command = [sys.executable, '-c', WERKZEUG_SERVER, str(port)]
+    process = subprocess.Popen(command, cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited during startup:\n{process.stderr.read().decode()}")
+        try:
+            if requests.get(base_url + '/ready', timeout=1).status_code == 200:
+                return process, base_url
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("App did not become ready within 60s")
+
+# Function to read the resident set size of a process and its children from /proc (Linux)
+def rss_bytes(pid):
+    total = 0
+    pids = [pid]
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            pids += [int(child) for child in f.read().split()]
+    except OSError:
+        pass
+    for each in pids:
+        try:
+            with open(f'/proc/{each}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            pass
+    return total
+
+class RssSampler(threading.Thread):
+    def __init__(self, pid, interval=0.05):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.peak = max(self.peak, rss_bytes(self.pid))
+            self.stopped.wait(self.interval)
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the News Article Analyzer offline")
+    parser.add_argument('--server', choices=['werkzeug', 'gunicorn'], default='werkzeug')
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--sizes-kb', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat-urls', action='store_true', help="reuse URLs so the result cache is exercised")
+    parser.add_argument('--max-p99', type=float, help="exit with status 1 when p99 latency exceeds this many seconds")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    pages = {f'/article/{size}': make_page(size / 1024, seed=size) for size in args.sizes_kb}
+    stub, stub_url = start_stub_server(pages)
+    port = free_port()
+    process, base_url = start_app(args.server, port, args.workers)
+    sampler = RssSampler(process.pid)
+    baseline_rss = rss_bytes(process.pid)
+    sampler.start()
+
+    # Round-robin over page sizes; a unique query string defeats the result cache unless --repeat-urls
+    targets = []
+    for i in range(args.requests):
+        size = args.sizes_kb[i % len(args.sizes_kb)]
+        suffix = '' if args.repeat_urls else f'?n={i}'
+        targets.append((size, f'{stub_url}/article/{size}{suffix}'))
+
+    local = threading.local()
+
+    def hit(target):
+        size, url = target
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            status = session.post(base_url + '/analyze', json={'url': url}, timeout=300).status_code
+        except requests.RequestException:
+            status = 'error'
+        return size, status, time.perf_counter() - start
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(hit, targets))
+        wall = time.perf_counter() - start
+    finally:
+        sampler.stopped.set()
+        sampler.join()
+        process.terminate()
+        process.wait(timeout=30)
+        stub.shutdown()
+
+    latencies = [elapsed for size, status, elapsed in results if status == 200]
+    statuses = Counter(str(status) for size, status, elapsed in results)
+    report = {
+        "server": args.server,
+        "concurrency": args.concurrency,
+        "requests": len(results),
+        "statuses": dict(statuses),
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "latency_seconds": {},
+        "per_size_p50_seconds": {},
+        "rss_mb": {"baseline": round(baseline_rss / 2**20, 1), "peak": round(sampler.peak / 2**20, 1)},
+    }
+    if latencies:
+        report["latency_seconds"] = {
+            "mean": round(statistics.mean(latencies), 4),
+            "p50": round(percentile(latencies, 0.50), 4),
+            "p95": round(percentile(latencies, 0.95), 4),
+            "p99": round(percentile(latencies, 0.99), 4),
+            "max": round(max(latencies), 4),
+        }
+        for size in args.sizes_kb:
+            sized = [elapsed for s, status, elapsed in results if s == size and status == 200]
+            if sized:
+                report["per_size_p50_seconds"][f"{size}KB"] = round(percentile(sized, 0.5), 4)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['requests']} requests against {args.server} at concurrency {args.concurrency} "
+              f"in {report['wall_seconds']}s: {report['throughput_rps']} req/s, statuses {report['statuses']}")
+        for name, value in report["latency_seconds"].items():
+            print(f"  {name:<5} {value * 1000:>9.1f}ms")
+        for size, value in report["per_size_p50_seconds"].items():
+            print(f"  p50 @ {size:<8} {value * 1000:>9.1f}ms")
+        print(f"  RSS   {report['rss_mb']['baseline']}MB at start, {report['rss_mb']['peak']}MB peak")
+
+    p99 = report["latency_seconds"].get("p99")
+    if args.max_p99 is not None and (p99 is None or p99 > args.max_p99):
+        print(f"p99 latency {p99}s exceeds the {args.max_p99}s budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
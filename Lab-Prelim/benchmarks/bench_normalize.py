@@ -0,0 +1,66 @@
+# Microbenchmark: text normalization (punctuation stripping, lowercasing, stopword removal)
+# Compares the original preprocess_text round-trip with preprocess_tokens, the normalizer the app runs on tokenizer output
+# Usage: python benchmarks/bench_normalize.py [--articles 200] [--words 800] [--repeat 5]
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from nltk.tokenize import word_tokenize
+from nlp_resources import resources
+from normalize import preprocess_tokens
+
+WORDS = ("The market's rally, led by tech giants (Apple, Google & Microsoft), beat expectations; "
+         "investors weren't worried about U.S. inflation - yet. Storm warnings: heavy snow, 50% chance!").split()
+
+def make_articles(n_articles, n_words, seed=3):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(n_words)) for _ in range(n_articles)]
+
+# The original preprocess_text, followed by the re-split its callers did
+def legacy_preprocess(text, stop_words):
+    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+    text = text.lower()
+    tokens = word_tokenize(text)
+    filtered_tokens = [w for w in tokens if not w in stop_words]
+    return word_tokenize(" ".join(filtered_tokens))
+
+def best_of(repeat, function):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text normalization")
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--words', type=int, default=800)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    stop_words = resources.get('stop_words')
+    articles = make_articles(args.articles, args.words)
+    # preprocess_tokens works on tokens the tokenizer already produced for the document
+    tokenized = [word_tokenize(article) for article in articles]
+    total_words = args.articles * args.words
+
+    cases = [
+        ("legacy preprocess_text + re-split", lambda: [legacy_preprocess(a, stop_words) for a in articles]),
+        ("word_tokenize + preprocess_tokens", lambda: [preprocess_tokens(word_tokenize(a), stop_words) for a in articles]),
+        ("preprocess_tokens (pre-tokenized)", lambda: [preprocess_tokens(t, stop_words) for t in tokenized]),
+    ]
+    print(f"{args.articles} articles x {args.words} words")
+    legacy = None
+    for name, function in cases:
+        elapsed = best_of(args.repeat, function)
+        legacy = legacy or elapsed
+        print(f"{name:<36} {elapsed * 1000:>8.1f}ms {total_words / elapsed / 1e6:>6.2f}M words/s {legacy / elapsed:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Benchmark: VADER on a whole article in one call vs. sentence-level scoring, serial and on a process pool
+# Usage: python benchmarks/bench_sentiment.py [--words 1000 5000 10000] [--workers 4]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from nlp_resources import resources
+from sentiment import SentimentScorer
+
+WORDS = ("the market rallied strongly as investors cheered great earnings but fears of a terrible "
+         "recession and awful inflation remain while the team celebrated a wonderful victory and "
+         "residents worried about the dangerous storm").split()
+
+# Function to build an article of roughly n_words words as a list of sentences
+def make_sentences(n_words, seed=7):
+    rng = random.Random(seed)
+    sentences = []
+    words = 0
+    while words < n_words:
+        length = rng.randint(8, 30)
+        sentence = " ".join(rng.choice(WORDS) for _ in range(length))
+        sentences.append(sentence.capitalize() + rng.choice([".", ".", "!", "?"]))
+        words += length
+    return sentences
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-call vs. sentence-level VADER scoring")
+    parser.add_argument('--words', type=int, nargs='+', default=[1000, 5000, 10000])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--skip-single', action='store_true', help="skip the single-call path (slow on long texts)")
+    args = parser.parse_args()
+
+    analyzer = resources.get('sentiment_analyzer')
+    serial = SentimentScorer(workers=0)
+    pooled = SentimentScorer(workers=args.workers, parallel_min_sentences=0)
+    pooled.score_sentences(make_sentences(2000))  # start the worker processes outside the timings
+
+    print(f"{'words':>8} {'sentences':>9} {'single call':>12} {'serial':>9} {f'{args.workers} procs':>9} "
+          f"{'serial w/s':>11} {'pool w/s':>10}")
+    for n_words in args.words:
+        sentences = make_sentences(n_words)
+        weights = [len(sentence.split()) for sentence in sentences]
+        if args.skip_single:
+            single = "-"
+        else:
+            elapsed, _ = timed(analyzer.polarity_scores, " ".join(sentences))
+            single = f"{elapsed * 1000:.0f}ms"
+        serial_time, _ = timed(serial.score, sentences, weights)
+        pooled_time, _ = timed(pooled.score, sentences, weights)
+        print(f"{n_words:>8} {len(sentences):>9} {single:>12} {serial_time * 1000:>7.0f}ms {pooled_time * 1000:>7.0f}ms "
+              f"{n_words / serial_time:>11.0f} {n_words / pooled_time:>10.0f}")
+    pooled.close()
+
+if __name__ == "__main__":
+    main()
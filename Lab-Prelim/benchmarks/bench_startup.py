@@ -0,0 +1,62 @@
+# Benchmark: cold start of the News Article Analyzer
+# Measures, in fresh interpreters, how long it takes to import News_Scraper and to get a 200 from /ready
+# for each warm-up mode, and fails when the lazy/background start exceeds the budget.
+# Usage: python benchmarks/bench_startup.py [--runs 5] [--budget 1.0]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+PROBE = """
+import time
+start = time.perf_counter()
+import News_Scraper
+imported = time.perf_counter()
+app = News_Scraper.create_app({mode!r})
+client = app.test_client()
+while client.get('/ready').status_code != 200:
+    if News_Scraper.resources.warmup_error:
+        raise SystemExit(News_Scraper.resources.warmup_error)
+    time.sleep(0.005)
+ready = time.perf_counter()
+print(imported - start, ready - start)
+"""
+
+# Run the probe in a fresh interpreter; returns (import seconds, ready seconds)
+def measure(mode):
+    output = subprocess.run([sys.executable, "-c", PROBE.format(mode=mode)], cwd=APP_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    imported, ready = output.split()
+    return float(imported), float(ready)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark News_Scraper cold start")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=1.0, help="seconds allowed until /ready in lazy/background mode")
+    parser.add_argument('--modes', nargs='+', default=['lazy', 'background', 'eager'])
+    args = parser.parse_args()
+
+    over_budget = False
+    print(f"{'mode':<12} {'import p50':>11} {'ready p50':>10} {'ready max':>10}")
+    for mode in args.modes:
+        try:
+            runs = [measure(mode) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as e:
+            print(f"{mode:<12} failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        import_times = [imported for imported, ready in runs]
+        ready_times = [ready for imported, ready in runs]
+        print(f"{mode:<12} {statistics.median(import_times) * 1000:>9.0f}ms "
+              f"{statistics.median(ready_times) * 1000:>8.0f}ms {max(ready_times) * 1000:>8.0f}ms")
+        if mode != 'eager' and max(ready_times) > args.budget:
+            over_budget = True
+
+    if over_budget:
+        print(f"Startup exceeded the {args.budget:.2f}s budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import gzip
+
+# Bodies smaller than this are sent uncompressed; the header overhead is not worth it
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/plain')
+
+# brotli is optional; gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Function to pick the best content coding the client accepts
+def choose_encoding(accept_encoding):
+    if brotli is not None and accept_encoding['br']:
+        return 'br'
+    if accept_encoding['gzip']:
+        return 'gzip'
+    return None
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+# Compress a buffered Flask response in place according to the request's Accept-Encoding
+def compress_response(request, response):
+    if (response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES or response.status_code < 200 or response.status_code == 204):
+        return response
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
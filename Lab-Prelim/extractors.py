@@ -0,0 +1,58 @@
+from importlib.util import find_spec
+
+# Each backend imports its parser on first call, so importing this module stays cheap.
+# Backends take the page as bytes plus the charset named by the response, if any; without one they detect
+# the encoding from the page itself (<meta charset>, BOM).
+
+# Function to extract paragraph text with BeautifulSoup, building only <p> nodes
+def extract_with_soup(content, encoding=None, parser='html.parser'):
+    from bs4 import BeautifulSoup, SoupStrainer
+    soup = BeautifulSoup(content, parser, parse_only=SoupStrainer('p'), from_encoding=encoding)
+    return " ".join(p.get_text() for p in soup.find_all('p'))
+
+# Function to extract paragraph text with lxml's C parser
+def extract_with_lxml(content, encoding=None):
+    import lxml.html
+    if not content.strip():
+        return ""
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    root = lxml.html.fromstring(content, parser=parser)
+    return " ".join(p.text_content() for p in root.iter('p'))
+
+# Function to extract paragraph text with selectolax (lexbor), the fastest backend
+def extract_with_selectolax(content, encoding=None):
+    from selectolax.lexbor import LexborHTMLParser
+    if encoding:
+        content = content.decode(encoding, errors='replace')
+    tree = LexborHTMLParser(content)
+    return " ".join(node.text(deep=True) for node in tree.css('p'))
+
+EXTRACTORS = {
+    'html.parser': extract_with_soup,
+    'lxml': extract_with_lxml,
+    'selectolax': extract_with_selectolax,
+}
+
+# Function to check whether an optional module is installed without importing it
+def is_installed(module):
+    try:
+        return find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
+
+# Function to list the extractors whose backend is installed
+def available_extractors():
+    names = ['html.parser']
+    if is_installed('lxml.html'):
+        names.append('lxml')
+    if is_installed('selectolax.lexbor'):
+        names.append('selectolax')
+    return names
+
+# Function to look up an extractor by name; defaults to the fastest installed backend
+def get_extractor(name=None):
+    if name is None:
+        name = available_extractors()[-1]
+    if name not in available_extractors():
+        raise ValueError(f"HTML extractor '{name}' is not available; choose one of {available_extractors()}")
+    return EXTRACTORS[name]
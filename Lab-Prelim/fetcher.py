@@ -0,0 +1,98 @@
+import threading
+
+# Default pool and timeout settings
+MAX_HOSTS = 32
+MAX_CONNECTIONS_PER_HOST = 8
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+POOL_TIMEOUT = 30
+CHUNK_SIZE = 64 * 1024
+USER_AGENT = "Mozilla/5.0 (compatible; NewsArticleAnalyzer/1.0)"
+
+# Function to build an HTTPAdapter whose blocking connection pools give up after pool_timeout seconds
+# (raising urllib3's EmptyPoolError) instead of waiting forever for a free connection
+def bounded_wait_adapter(pool_timeout, **kwargs):
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class BoundedWaitHTTPConnectionPool(HTTPConnectionPool):
+        def _get_conn(self, timeout=None):
+            return super()._get_conn(pool_timeout if timeout is None else timeout)
+
+    class BoundedWaitHTTPSConnectionPool(HTTPSConnectionPool):
+        def _get_conn(self, timeout=None):
+            return super()._get_conn(pool_timeout if timeout is None else timeout)
+
+    class BoundedWaitAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **pool_kwargs):
+            super().init_poolmanager(*args, **pool_kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": BoundedWaitHTTPConnectionPool, "https": BoundedWaitHTTPSConnectionPool}
+
+    return BoundedWaitAdapter(**kwargs)
+
+# Pooled HTTP fetcher: one shared session keeps TCP/TLS connections to each news host alive across requests
+class ArticleFetcher:
+    def __init__(self, max_hosts=MAX_HOSTS, max_connections_per_host=MAX_CONNECTIONS_PER_HOST,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT, pool_timeout=POOL_TIMEOUT,
+                 chunk_size=CHUNK_SIZE):
+        self.max_hosts = max_hosts
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_timeout = pool_timeout
+        self.chunk_size = chunk_size
+        self._session = None
+        self._lock = threading.Lock()
+
+    # The session (and requests itself) is created on first use to keep app startup fast
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        import requests
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        # pool_block makes callers wait for a free connection instead of opening more than the per-host limit;
+        # the wait is bounded by pool_timeout
+        adapter = bounded_wait_adapter(self.pool_timeout, pool_connections=self.max_hosts,
+                                       pool_maxsize=self.max_connections_per_host, pool_block=True)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    # Open a streamed response; the caller must close it. Error responses are closed here so their
+    # connection goes back to the pool.
+    def open(self, url, headers=None):
+        import requests
+        from urllib3.exceptions import EmptyPoolError
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+        except EmptyPoolError as e:
+            raise requests.ConnectionError(f"No free connection to the host within {self.pool_timeout}s: {e}") from e
+        try:
+            response.raise_for_status()
+        except BaseException:
+            response.close()
+            raise
+        return response
+
+    # Conditional GET: sends If-None-Match/If-Modified-Since when validators are known; the caller must close it
+    def open_page(self, url, etag=None, last_modified=None):
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return self.open(url, headers=headers)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+fetcher = ArticleFetcher()
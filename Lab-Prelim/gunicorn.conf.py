@@ -0,0 +1,25 @@
+# Gunicorn settings for serving News_Scraper in production.
+# Every value can be overridden through the environment.
+import gc
+import multiprocessing
+import os
+
+wsgi_app = "wsgi:app"
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+
+# One worker per core; each worker serves THREADS requests concurrently while downloads are in flight
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("THREADS", 8))
+worker_class = "gthread"
+timeout = int(os.environ.get("TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("KEEPALIVE", 5))
+
+# Import the app (NLTK data, stopwords, VADER lexicon) once in the master before forking workers.
+# With WARMUP_MODE=background or lazy each worker loads its own copy instead, and becomes ready sooner.
+preload_app = os.environ.get("WARMUP_MODE", "eager") == "eager"
+
+# Move the preloaded objects out of the garbage collector's generations so collections in the
+# workers do not touch (and copy) the shared pages
+def when_ready(server):
+    gc.freeze()
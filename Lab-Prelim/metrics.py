@@ -0,0 +1,125 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Minimal Prometheus text-format metrics: counters and histograms with label sets
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+WORD_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 1000000)
+BYTE_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7, 2.5e7, 5e7, 1e8)
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+def format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{format_labels(key)} {format_value(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            series["counts"][bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else format_value(bound)
+                    lines.append(f"{self.name}_bucket{format_labels(key + (('le', le),))} {cumulative}")
+                lines.append(f"{self.name}_sum{format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{format_labels(key)} {series['count']}")
+        return lines
+
+# Registry of every metric plus optional gauge callbacks (e.g. cache and resource counters)
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+        self._gauge_callbacks = []
+
+    def counter(self, name, help_text):
+        metric = Counter(name, help_text)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, help_text, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    # Register a callback returning {(metric name, labels tuple): value} read at scrape time
+    def gauges(self, callback):
+        self._gauge_callbacks.append(callback)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for callback in self._gauge_callbacks:
+            seen = set()
+            for (name, labels), value in sorted(callback().items()):
+                if name not in seen:
+                    lines.append(f"# TYPE {name} gauge")
+                    seen.add(name)
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+stage_seconds = metrics.histogram("news_analyze_stage_seconds", "Latency of each /analyze pipeline stage")
+request_seconds = metrics.histogram("news_request_seconds", "End-to-end latency of analysis requests")
+article_words = metrics.histogram("news_article_words", "Words per analyzed article", WORD_BUCKETS)
+article_chars = metrics.histogram("news_article_chars", "Characters of extracted text per analyzed article", BYTE_BUCKETS)
+requests_total = metrics.counter("news_requests_total", "Analysis requests by route and outcome")
+
+# Time a pipeline stage; durations go to the stage histogram and, when given, to a per-request timing list
+@contextmanager
+def span(stage, timings=None):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_seconds.observe(elapsed, stage=stage)
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+# Function to format recorded spans as a Server-Timing header value
+def server_timing_header(timings):
+    return ", ".join(f"{stage};dur={elapsed * 1000:.2f}" for stage, elapsed in timings)
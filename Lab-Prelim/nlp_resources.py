@@ -0,0 +1,165 @@
+import os
+import sys
+import threading
+import time
+
+# Startup modes: 'eager' loads everything before serving, 'background' loads on a warm-up thread,
+# 'lazy' loads each resource on first use
+WARMUP_MODES = ('eager', 'background', 'lazy')
+
+# NLTK packages the analyzer needs besides the Punkt sentence model: (resource path, package name)
+NLTK_PACKAGES = [('corpora/stopwords', 'stopwords')]
+
+# Registry of expensive NLP resources, loaded once per process and shared by every request
+class ResourceRegistry:
+    def __init__(self):
+        self._loaders = {}
+        self._resources = {}
+        self._stats = {}
+        # Re-entrant so a loader can depend on another resource
+        self._lock = threading.RLock()
+        self.warmup_mode = 'lazy'
+        self.warmup_error = None
+        self._warmup_done = threading.Event()
+
+    # Register a zero-argument loader under a name
+    def register(self, name, loader):
+        self._loaders[name] = loader
+        self._stats[name] = {"loaded": False, "load_seconds": 0.0, "loads": 0, "hits": 0}
+
+    # Return the named resource, loading it on first use
+    def get(self, name):
+        resource = self._resources.get(name)
+        if resource is not None:
+            self._stats[name]["hits"] += 1
+            return resource
+        with self._lock:
+            resource = self._resources.get(name)
+            if resource is None:
+                start = time.perf_counter()
+                resource = self._loaders[name]()
+                stats = self._stats[name]
+                stats["load_seconds"] = time.perf_counter() - start
+                stats["loads"] += 1
+                stats["loaded"] = True
+                self._resources[name] = resource
+            else:
+                self._stats[name]["hits"] += 1
+        return resource
+
+    # Load every registered resource up front so no request pays the load cost
+    def warm_up(self):
+        try:
+            for name in self._loaders:
+                self.get(name)
+        except Exception as e:
+            self.warmup_error = str(e)
+            raise
+        finally:
+            self._warmup_done.set()
+
+    # Start warming up according to the startup mode
+    def start(self, mode='eager'):
+        if mode not in WARMUP_MODES:
+            raise ValueError(f"Unknown warm-up mode '{mode}'; choose one of {WARMUP_MODES}")
+        self.warmup_mode = mode
+        if mode == 'eager':
+            self.warm_up()
+        elif mode == 'background':
+            threading.Thread(target=self._warm_up_quietly, name="nlp-warmup", daemon=True).start()
+
+    def _warm_up_quietly(self):
+        try:
+            self.warm_up()
+        except Exception as e:
+            print(f"NLP resource warm-up failed: {e}")
+
+    # True once every registered resource has been loaded; in lazy mode the app is ready as soon as it imports
+    def ready(self):
+        if self.warmup_mode == 'lazy':
+            return True
+        return all(stats["loaded"] for stats in self._stats.values())
+
+    def stats(self):
+        stats = {name: dict(stats) for name, stats in self._stats.items()}
+        stats["warmup"] = {"mode": self.warmup_mode, "done": self._warmup_done.is_set(), "error": self.warmup_error}
+        return stats
+
+# Function to list the NLTK packages to check and bundle. NLTK 3.8.2+ tokenizes with PunktTokenizer, which
+# loads the pickle-free punkt_tab data; older releases load the punkt pickles.
+def nltk_packages():
+    import nltk.tokenize
+    if hasattr(nltk.tokenize, 'PunktTokenizer'):
+        punkt = ('tokenizers/punkt_tab/english/', 'punkt_tab')
+    else:
+        punkt = ('tokenizers/punkt', 'punkt')
+    return [punkt] + NLTK_PACKAGES
+
+# Function to make sure the NLTK data is available. NLTK_DATA points at a pre-bundled data directory;
+# with NLTK_OFFLINE=1 missing data is an error instead of a download.
+def ensure_nltk_data():
+    import nltk
+    missing = []
+    for path, package in nltk_packages():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(package)
+    if not missing:
+        return True
+
+    if os.environ.get('NLTK_OFFLINE') == '1':
+        raise RuntimeError(f"NLTK data {missing} not found in {nltk.data.path} and NLTK_OFFLINE=1 forbids downloading.")
+
+    print("NLTK data not found. Attempting to download...")
+    download_nltk_data(missing)
+    print("NLTK data downloaded successfully.")
+    return True
+
+# Function to download NLTK packages, optionally into a directory that can be bundled with the app
+def download_nltk_data(packages, download_dir=None):
+    import ssl
+    import nltk
+    # Try to create an unverified HTTPS context
+    try:
+        _create_unverified_https_context = ssl._create_unverified_context
+    except AttributeError:
+        pass
+    else:
+        ssl._create_default_https_context = _create_unverified_https_context
+
+    for package in packages:
+        if not nltk.download(package, download_dir=download_dir, quiet=True):
+            raise RuntimeError(f"Failed to download NLTK data '{package}'. Please download the required NLTK data manually.")
+
+# Function to load the English stopword set
+def load_stop_words():
+    resources.get('nltk_data')
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+# Function to build the VADER analyzer (parses the full lexicon file)
+def load_sentiment_analyzer():
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+# Function to load the Punkt sentence model and word tokenizer; returns (sent_tokenize, word_tokenize)
+def load_tokenizers():
+    resources.get('nltk_data')
+    from nltk.tokenize import sent_tokenize, word_tokenize
+    word_tokenize("Warm up the tokenizers. They are loaded once.")
+    return sent_tokenize, word_tokenize
+
+resources = ResourceRegistry()
+resources.register('nltk_data', ensure_nltk_data)
+resources.register('tokenizers', load_tokenizers)
+resources.register('stop_words', load_stop_words)
+resources.register('sentiment_analyzer', load_sentiment_analyzer)
+
+# Pre-bundle the NLTK data for offline images: python nlp_resources.py <directory>
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python nlp_resources.py <nltk data directory>")
+        sys.exit(1)
+    download_nltk_data([package for path, package in nltk_packages()], download_dir=sys.argv[1])
+    print(f"NLTK data saved to {sys.argv[1]}; set NLTK_DATA={sys.argv[1]} NLTK_OFFLINE=1 when serving.")
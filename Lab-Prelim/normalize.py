@@ -0,0 +1,20 @@
+import re
+
+# Precompiled pattern: characters that are not ASCII letters or digits
+NON_ALNUM = re.compile(r'[^a-zA-Z0-9]+')
+
+# Preprocess tokens: strip punctuation, lowercase and drop stopwords.
+# Plain ASCII alphanumeric tokens (the vast majority) skip the regex entirely.
+def preprocess_tokens(tokens, stop_words):
+    filtered_tokens = []
+    append = filtered_tokens.append
+    strip = NON_ALNUM.sub
+    for token in tokens:
+        if not (token.isascii() and token.isalnum()):
+            token = strip('', token)
+            if not token:
+                continue
+        token = token.lower()
+        if token not in stop_words:
+            append(token)
+    return filtered_tokens
@@ -0,0 +1,113 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Default cache settings; besides the entry count, the cache holds at most MAX_TEXT_CHARS characters of
+# article text and result strings (summaries can be nearly as long as the article)
+MAX_ENTRIES = 1024
+MAX_TEXT_CHARS = 64 * 1024 * 1024
+TTL_SECONDS = 300
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Function to normalize a URL so trivially different spellings share one cache entry
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith(TRACKING_PARAMS))
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+# Function to hash extracted article text
+def hash_text(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+# Cached analysis of one URL, with the validators needed for a conditional GET
+class CacheEntry:
+    def __init__(self, article_text, result, content_hash, etag=None, last_modified=None, age=0):
+        self.article_text = article_text
+        self.result = result
+        self.content_hash = content_hash
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic() - age
+        self.size = len(article_text) + sum(len(value) for value in result.values() if isinstance(value, str))
+
+    def age(self):
+        return time.monotonic() - self.fetched_at
+
+# LRU cache of analysis results with a freshness TTL; stale entries are kept for revalidation until evicted.
+# Entries are evicted when either the entry count or the total text size goes over its limit.
+class AnalysisCache:
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, max_text_chars=MAX_TEXT_CHARS):
+        self.max_entries = max_entries
+        self.max_text_chars = max_text_chars
+        self.ttl = ttl
+        self.text_chars = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "unchanged": 0, "evictions": 0, "too_large": 0}
+
+    # Return (entry, fresh) for a key; entry is None on a miss
+    def lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if entry.age() < self.ttl:
+                self._stats["hits"] += 1
+                return entry, True
+            self._stats["stale"] += 1
+            return entry, False
+
+    # Mark a stale entry fresh again after the origin answered 304 Not Modified
+    def revalidate(self, entry):
+        with self._lock:
+            entry.fetched_at = time.monotonic()
+            self._stats["revalidated"] += 1
+
+    # Record that a re-downloaded page had the same content hash, so its analysis was reused
+    def record_unchanged(self):
+        with self._lock:
+            self._stats["unchanged"] += 1
+
+    # Add or replace an entry; an entry larger than the whole size limit is not cached
+    def put(self, key, entry):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.text_chars -= previous.size
+            if entry.size > self.max_text_chars:
+                self._stats["too_large"] += 1
+                return
+            self._entries[key] = entry
+            self.text_chars += entry.size
+            while len(self._entries) > self.max_entries or self.text_chars > self.max_text_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self.text_chars -= evicted.size
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.text_chars = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+            stats["text_chars"] = self.text_chars
+            stats["max_text_chars"] = self.max_text_chars
+            stats["ttl"] = self.ttl
+        return stats
+
+analysis_cache = AnalysisCache()
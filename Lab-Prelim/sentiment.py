@@ -0,0 +1,77 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from nlp_resources import resources
+
+# Sentences scored per task, and the document size below which a process pool is not worth the IPC
+SENTIMENT_BATCH_SIZE = 256
+PARALLEL_MIN_SENTENCES = 2000
+
+# VADER compound thresholds for labelling a sentence
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+# Function to score a batch of sentences with VADER (runs in the worker processes too)
+def score_batch(sentences):
+    analyzer = resources.get('sentiment_analyzer')
+    return [analyzer.polarity_scores(sentence) for sentence in sentences]
+
+# Function to combine per-sentence scores into document-level scores, weighting each sentence by its length,
+# plus the distribution of positive/neutral/negative sentences
+def aggregate_scores(scores, weights):
+    document = {"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0}
+    distribution = {"positive": 0, "neutral": 0, "negative": 0}
+    total_weight = 0
+    for score, weight in zip(scores, weights):
+        for key in document:
+            document[key] += score[key] * weight
+        total_weight += weight
+        if score["compound"] >= POSITIVE_THRESHOLD:
+            distribution["positive"] += 1
+        elif score["compound"] <= NEGATIVE_THRESHOLD:
+            distribution["negative"] += 1
+        else:
+            distribution["neutral"] += 1
+    if total_weight:
+        document = {key: round(value / total_weight, 4) for key, value in document.items()}
+    else:
+        document["neu"] = 1.0
+    return document, distribution
+
+# Sentence-level VADER scoring; long documents are split into batches and scored on a process pool
+class SentimentScorer:
+    def __init__(self, workers=0, batch_size=SENTIMENT_BATCH_SIZE, parallel_min_sentences=PARALLEL_MIN_SENTENCES):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.parallel_min_sentences = parallel_min_sentences
+        self._executor = None
+        self._lock = threading.Lock()
+
+    # Worker processes are spawned (not forked) so they never inherit the server's threads or locks
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                         mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def score_sentences(self, sentences):
+        if self.workers < 1 or len(sentences) < self.parallel_min_sentences:
+            return score_batch(sentences)
+        batches = [sentences[i:i + self.batch_size] for i in range(0, len(sentences), self.batch_size)]
+        scores = []
+        for batch_scores in self.executor.map(score_batch, batches):
+            scores.extend(batch_scores)
+        return scores
+
+    # Return (document scores, sentence distribution) for a list of sentences and their weights
+    def score(self, sentences, weights):
+        return aggregate_scores(self.score_sentences(sentences), weights)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,40 @@
+import threading
+from concurrent.futures import Future
+
+# Request coalescing: concurrent calls with the same key share one execution and its result (or exception)
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, function, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = self._calls[key] = Future()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self):
+        with self._lock:
+            return {"in_flight": len(self._calls), "executions": self.executions, "coalesced": self.coalesced}
@@ -0,0 +1,86 @@
+import codecs
+from html.parser import HTMLParser
+
+# Tags whose start implicitly closes an open <p>, as in the HTML parsing rules
+BLOCK_TAGS = frozenset([
+    "address", "article", "aside", "blockquote", "div", "dl", "fieldset", "figure", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "nav", "ol", "p", "pre", "section",
+    "table", "ul",
+])
+# Tags whose text is never article content
+SKIP_TAGS = frozenset(["script", "style", "template", "noscript"])
+
+# Incremental HTML tokenizer that collects the text of each <p> and hands back finished paragraphs
+class ParagraphParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.in_paragraph = False
+        self.skip_depth = 0
+        self.buffer = []
+        self.completed = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.flush()
+            self.in_paragraph = tag == "p"
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag == "p" or (tag in BLOCK_TAGS and self.in_paragraph):
+            self.flush()
+
+    def handle_data(self, data):
+        if self.in_paragraph and not self.skip_depth:
+            self.buffer.append(data)
+
+    def flush(self):
+        if self.in_paragraph:
+            self.completed.append("".join(self.buffer))
+        self.buffer = []
+        self.in_paragraph = False
+
+    # Return and forget the paragraphs finished so far
+    def drain(self):
+        completed, self.completed = self.completed, []
+        return completed
+
+# Iterable of paragraph texts parsed from a stream of body chunks; stops reading after max_bytes
+class ParagraphStream:
+    def __init__(self, chunks, encoding="utf-8", max_bytes=None):
+        self.chunks = chunks
+        self.encoding = encoding
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.truncated = False
+
+    def __iter__(self):
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        parser = ParagraphParser()
+        for chunk in self.chunks:
+            if self.max_bytes is not None and self.bytes_read + len(chunk) > self.max_bytes:
+                chunk = chunk[:self.max_bytes - self.bytes_read]
+                self.truncated = True
+            self.bytes_read += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            yield from parser.drain()
+            if self.truncated:
+                break
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+        parser.flush()
+        yield from parser.drain()
+
+# Function to pick the body charset from the Content-Type header; `default` when it names none (or an unknown one)
+def response_charset(response, default="utf-8"):
+    content_type = response.headers.get("Content-Type", "")
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            try:
+                return codecs.lookup(value.strip('"\'')).name
+            except LookupError:
+                break
+    return default
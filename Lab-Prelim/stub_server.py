@@ -0,0 +1,52 @@
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+# Local stub news server: serves fixed HTML pages from memory so the fetcher can be exercised without network access
+class StubNewsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        page = self.server.pages.get(urlsplit(self.path).path)
+        if page is None:
+            self.send_error(404)
+            return
+        body = page.encode('utf-8') if isinstance(page, str) else page
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            self.server.requests_served += 1
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.requests_served += 1
+
+    def log_message(self, format, *args):
+        pass
+
+# Start a stub server on a free local port; returns the server and its base URL
+def start_stub_server(pages, host="127.0.0.1", port=0):
+    server = ThreadingHTTPServer((host, port), StubNewsHandler)
+    server.daemon_threads = True
+    server.pages = dict(pages)
+    server.requests_served = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_port}"
+
+if __name__ == "__main__":
+    sample = "<html><body><p>The stub server is running.</p><p>Point the analyzer at /article.</p></body></html>"
+    server, base_url = start_stub_server({"/article": sample}, port=8000)
+    print(f"Serving stub article at {base_url}/article")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,8 @@
+# Production entry point for the News Article Analyzer.
+# Run from Lab-Prelim:
+#   gunicorn -c gunicorn.conf.py
+# or with explicit settings:
+#   gunicorn --preload --workers 4 --threads 8 --worker-class gthread --bind 0.0.0.0:8000 wsgi:app
+from News_Scraper import create_app
+
+app = create_app()
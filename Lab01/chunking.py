@@ -0,0 +1,53 @@
+import re
+
+# Boundaries to split on, coarsest first: paragraphs, sentences, then any whitespace.
+# Group 1 is the separator dropped between spans; closing quotes and brackets stay with their sentence.
+PARAGRAPH_BREAK = re.compile(r'(\n\s*\n)')
+SENTENCE_END = re.compile(r'(?<=[.!?])["\')\]]*(\s+)')
+WHITESPACE = re.compile(r'(\s+)')
+BOUNDARIES = [PARAGRAPH_BREAK, SENTENCE_END, WHITESPACE]
+
+# Function to yield (start, end) spans of text[start:end] no longer than max_chars, splitting at the coarsest
+# boundary that works and cutting hard only when a single word is longer than max_chars
+def iter_spans(text, start, end, max_chars, level=0):
+    if end - start <= max_chars:
+        if end > start:
+            yield start, end
+        return
+    if level == len(BOUNDARIES):
+        for position in range(start, end, max_chars):
+            yield position, min(position + max_chars, end)
+        return
+    position = start
+    for match in BOUNDARIES[level].finditer(text, start, end):
+        yield from iter_spans(text, position, match.start(1), max_chars, level + 1)
+        position = match.end(1)
+    yield from iter_spans(text, position, end, max_chars, level + 1)
+
+# Function to split text into chunks of at most max_chars, packing whole paragraphs (or sentences) together.
+# Yields (offset, chunk) where chunk == text[offset:offset + len(chunk)], so offsets inside a chunk map back
+# to the original text by adding `offset`.
+def iter_chunks(text, max_chars):
+    chunk_start = chunk_end = None
+    for start, end in iter_spans(text, 0, len(text), max_chars):
+        if chunk_start is not None and end - chunk_start > max_chars:
+            yield chunk_start, text[chunk_start:chunk_end]
+            chunk_start = None
+        if chunk_start is None:
+            chunk_start = start
+        chunk_end = end
+    if chunk_start is not None:
+        yield chunk_start, text[chunk_start:chunk_end]
+
+# Function to turn (text, context) documents into (chunk, (context, offset, last)) tuples for nlp.pipe.
+# Every document produces at least one chunk so empty documents still get a record.
+def iter_document_chunks(documents, max_chars):
+    for text, context in documents:
+        previous = None
+        for offset, chunk in iter_chunks(text, max_chars):
+            if previous is not None:
+                yield previous[1], (context, previous[0], False)
+            previous = offset, chunk
+        if previous is None:
+            previous = 0, ''
+        yield previous[1], (context, previous[0], True)
@@ -0,0 +1,236 @@
+# Persistent index over the entities produced by ner_pipeline.py, so entity questions can be answered
+# without re-running spaCy.
+# Usage: python entity_index.py entities.sqlite3 ingest entities.jsonl [more.jsonl ...]
+#        python entity_index.py entities.sqlite3 top [--label ORG] [-k 20]
+#        python entity_index.py entities.sqlite3 cooccur "Google" [--label ORG] [-k 20]
+#        python entity_index.py entities.sqlite3 mentions "Google" [--label ORG] [-k 20]
+#        python entity_index.py entities.sqlite3 labels
+import argparse
+import json
+import sqlite3
+import time
+from array import array
+from collections import defaultdict
+
+# documents: one row per indexed document. entities: one row per distinct (text, label) with running totals.
+# postings: which entities occur in which documents, with the mention offsets packed as an array of
+# (start, end) uint32 pairs, which keeps millions of mentions compact.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_key TEXT NOT NULL UNIQUE,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    label TEXT NOT NULL,
+    mention_count INTEGER NOT NULL DEFAULT 0,
+    document_count INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (text, label)
+);
+CREATE INDEX IF NOT EXISTS entities_label ON entities(label, mention_count);
+CREATE INDEX IF NOT EXISTS entities_mentions ON entities(mention_count);
+CREATE TABLE IF NOT EXISTS postings (
+    entity_id INTEGER NOT NULL REFERENCES entities(id),
+    document_id INTEGER NOT NULL REFERENCES documents(id),
+    mentions INTEGER NOT NULL,
+    offsets BLOB NOT NULL,
+    PRIMARY KEY (entity_id, document_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_document ON postings(document_id, entity_id);
+"""
+
+# Function to normalize entity text so the same name split across lines is one entity
+def normalize_entity(text):
+    return ' '.join(text.split())
+
+def pack_offsets(offsets):
+    return array('I', offsets).tobytes()
+
+def unpack_offsets(blob):
+    values = array('I')
+    values.frombytes(blob)
+    return list(zip(values[::2], values[1::2]))
+
+class EntityIndex:
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _entity_id(self, text, label):
+        connection = self.connection
+        connection.execute("INSERT OR IGNORE INTO entities (text, label) VALUES (?, ?)", (text, label))
+        return connection.execute("SELECT id FROM entities WHERE text = ? AND label = ?", (text, label)).fetchone()[0]
+
+    # Forget a document's postings and take them off the entity totals
+    def _remove_document(self, document_id):
+        connection = self.connection
+        for entity_id, mentions in connection.execute(
+                "SELECT entity_id, mentions FROM postings WHERE document_id = ?", (document_id,)).fetchall():
+            connection.execute(
+                "UPDATE entities SET mention_count = mention_count - ?, document_count = document_count - 1 WHERE id = ?",
+                (mentions, entity_id))
+        connection.execute("DELETE FROM postings WHERE document_id = ?", (document_id,))
+
+    # Index one ner_pipeline record ({"id": ..., "entities": [{"text", "label", "start", "end"}, ...]}).
+    # Re-indexing a document replaces its previous postings. Runs inside the caller's transaction.
+    def _add_record(self, record):
+        connection = self.connection
+        doc_key = str(record["id"])
+        row = connection.execute("SELECT id FROM documents WHERE doc_key = ?", (doc_key,)).fetchone()
+        if row is None:
+            document_id = connection.execute("INSERT INTO documents (doc_key, indexed_at) VALUES (?, ?)",
+                                             (doc_key, time.time())).lastrowid
+        else:
+            document_id = row[0]
+            self._remove_document(document_id)
+            connection.execute("UPDATE documents SET indexed_at = ? WHERE id = ?", (time.time(), document_id))
+
+        offsets = defaultdict(list)
+        for entity in record["entities"]:
+            offsets[normalize_entity(entity["text"]), entity["label"]] += [entity["start"], entity["end"]]
+        for (text, label), positions in offsets.items():
+            entity_id = self._entity_id(text, label)
+            mentions = len(positions) // 2
+            connection.execute("INSERT INTO postings (entity_id, document_id, mentions, offsets) VALUES (?, ?, ?, ?)",
+                               (entity_id, document_id, mentions, pack_offsets(positions)))
+            connection.execute(
+                "UPDATE entities SET mention_count = mention_count + ?, document_count = document_count + 1 WHERE id = ?",
+                (mentions, entity_id))
+
+    # Index records as they stream past, committing every batch_size documents; yields each record unchanged
+    # so the index can be updated while ner_pipeline writes its JSONL output
+    def indexed(self, records, batch_size=500):
+        pending = 0
+        try:
+            for record in records:
+                self._add_record(record)
+                pending += 1
+                if pending >= batch_size:
+                    self.connection.commit()
+                    pending = 0
+                yield record
+        finally:
+            self.connection.commit()
+
+    # Index an iterable of records; returns the number of documents indexed
+    def add_records(self, records, batch_size=500):
+        count = 0
+        for record in self.indexed(records, batch_size):
+            count += 1
+        return count
+
+    def _entity_ids(self, text, label=None):
+        text = normalize_entity(text)
+        if label is None:
+            rows = self.connection.execute("SELECT id FROM entities WHERE text = ?", (text,)).fetchall()
+        else:
+            rows = self.connection.execute("SELECT id FROM entities WHERE text = ? AND label = ?", (text, label)).fetchall()
+        return [row[0] for row in rows]
+
+    # Most mentioned entities, optionally for one label; returns [(text, label, mentions, documents), ...]
+    def top_entities(self, label=None, k=10):
+        query = "SELECT text, label, mention_count, document_count FROM entities WHERE document_count > 0"
+        params = ()
+        if label is not None:
+            query += " AND label = ?"
+            params = (label,)
+        query += " ORDER BY mention_count DESC LIMIT ?"
+        return self.connection.execute(query, params + (k,)).fetchall()
+
+    # Entities sharing the most documents with the given entity; returns [(text, label, shared documents), ...]
+    def cooccurring(self, text, label=None, k=10):
+        entity_ids = self._entity_ids(text, label)
+        if not entity_ids:
+            return []
+        placeholders = ','.join('?' * len(entity_ids))
+        return self.connection.execute(
+            f"SELECT e.text, e.label, COUNT(DISTINCT other.document_id) AS shared "
+            f"FROM postings target JOIN postings other ON other.document_id = target.document_id "
+            f"JOIN entities e ON e.id = other.entity_id "
+            f"WHERE target.entity_id IN ({placeholders}) AND other.entity_id NOT IN ({placeholders}) "
+            f"GROUP BY other.entity_id ORDER BY shared DESC LIMIT ?",
+            entity_ids + entity_ids + [k]).fetchall()
+
+    # Documents mentioning an entity, most mentions first; returns [(doc_key, label, [(start, end), ...]), ...]
+    def mentions(self, text, label=None, k=10):
+        entity_ids = self._entity_ids(text, label)
+        if not entity_ids:
+            return []
+        placeholders = ','.join('?' * len(entity_ids))
+        rows = self.connection.execute(
+            f"SELECT d.doc_key, e.label, p.offsets FROM postings p JOIN documents d ON d.id = p.document_id "
+            f"JOIN entities e ON e.id = p.entity_id WHERE p.entity_id IN ({placeholders}) "
+            f"ORDER BY p.mentions DESC LIMIT ?", entity_ids + [k]).fetchall()
+        return [(doc_key, label, unpack_offsets(offsets)) for doc_key, label, offsets in rows]
+
+    # Per-label totals; returns [(label, distinct entities, mentions), ...]
+    def labels(self):
+        return self.connection.execute(
+            "SELECT label, COUNT(*), SUM(mention_count) FROM entities WHERE document_count > 0 "
+            "GROUP BY label ORDER BY SUM(mention_count) DESC").fetchall()
+
+    def stats(self):
+        connection = self.connection
+        return {
+            "documents": connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0],
+            "entities": connection.execute("SELECT COUNT(*) FROM entities WHERE document_count > 0").fetchone()[0],
+            "mentions": connection.execute("SELECT COALESCE(SUM(mention_count), 0) FROM entities").fetchone()[0],
+        }
+
+# Function to read ner_pipeline output records from a JSONL file
+def iter_records(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or update the entity index built from ner_pipeline.py output")
+    parser.add_argument('index', help="SQLite index file (created if missing)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest = commands.add_parser('ingest', help="add ner_pipeline JSONL output to the index")
+    ingest.add_argument('files', nargs='+')
+    for name in ('top', 'cooccur', 'mentions'):
+        command = commands.add_parser(name)
+        if name != 'top':
+            command.add_argument('entity')
+        command.add_argument('--label')
+        command.add_argument('-k', type=int, default=10)
+    commands.add_parser('labels')
+    commands.add_parser('stats')
+    args = parser.parse_args()
+
+    index = EntityIndex(args.index)
+    try:
+        if args.command == 'ingest':
+            start = time.perf_counter()
+            count = sum(index.add_records(iter_records(path)) for path in args.files)
+            print(f"Indexed {count} documents in {time.perf_counter() - start:.1f}s")
+        elif args.command == 'top':
+            for text, label, mentions, documents in index.top_entities(args.label, args.k):
+                print(f"{mentions:>8} {documents:>8}  {label:<10} {text}")
+        elif args.command == 'cooccur':
+            for text, label, shared in index.cooccurring(args.entity, args.label, args.k):
+                print(f"{shared:>8}  {label:<10} {text}")
+        elif args.command == 'mentions':
+            for doc_key, label, offsets in index.mentions(args.entity, args.label, args.k):
+                print(f"{len(offsets):>6}  {label:<10} {doc_key}  {offsets[:5]}")
+        elif args.command == 'labels':
+            for label, entities, mentions in index.labels():
+                print(f"{label:<10} {entities:>8} entities {mentions:>10} mentions")
+        else:
+            print(json.dumps(index.stats(), indent=2))
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main()
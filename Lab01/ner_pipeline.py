@@ -0,0 +1,152 @@
+# Batch named entity recognition over many documents.
+# Documents stream through nlp.pipe in batches (optionally on several processes) with the pipeline components
+# NER does not need left out, and entities are written to JSONL as each document finishes. Long documents are
+# split into bounded paragraph/sentence chunks so no Doc exceeds max_length, with entity offsets mapped back to
+# the original text.
+# Usage: python ner_pipeline.py urls.txt -o entities.jsonl [--batch-size 64] [--n-process 4]
+#        python ner_pipeline.py documents.jsonl -o entities.jsonl      (one {"id": ..., "text": ...} per line)
+#        add --index entities.sqlite3 to update the entity index as documents finish
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+import spacy
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from chunking import iter_document_chunks
+from entity_index import EntityIndex
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Largest chunk handed to the pipeline; NER memory grows with Doc length, so this bounds peak memory per process
+DEFAULT_CHUNK_CHARS = 10000
+
+# Components of the English pipelines that entity recognition does not use; ner only needs tok2vec
+NER_EXCLUDE = ["parser", "lemmatizer", "tagger", "attribute_ruler", "senter"]
+
+# Function to load a spaCy pipeline for NER-only runs
+def load_ner_model(model=DEFAULT_MODEL, exclude=NER_EXCLUDE):
+    return spacy.load(model, exclude=exclude)
+
+# Function to fetch a page and join the text of its paragraphs, as the notebook does.
+# Paragraphs are separated by blank lines so the chunker can split on them.
+def fetch_page_text(url, session=requests, timeout=30):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, 'html.parser')
+    return '\n\n'.join([p.get_text() for p in soup.find_all('p')])
+
+# Function to fetch pages concurrently, keeping at most `window` requests in flight.
+# Yields (text, {"id": url}) in completion order; pages that fail are reported on stderr and skipped.
+def iter_url_documents(urls, workers=8, window=None, timeout=30):
+    window = window or workers * 2
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    urls = iter(urls)
+    pending = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            for url in urls:
+                pending[executor.submit(fetch_page_text, url, session, timeout)] = url
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    yield future.result(), {"id": url}
+                except requests.RequestException as e:
+                    print(f"Skipping {url}: {e}", file=sys.stderr)
+    session.close()
+
+# Function to read documents from a JSONL file with "id" and "text" fields
+def iter_jsonl_documents(path):
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield record["text"], {"id": record.get("id", line_number)}
+
+# Function to read URLs from a text file, one per line (blank lines and # comments are ignored)
+def iter_urls(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+# Function to run documents through the pipeline in batches of chunks.
+# `documents` is an iterable of (text, context) pairs; yields one record per document, with entity offsets
+# relative to the whole document. nlp.pipe keeps input order, so a document's chunks arrive together and only
+# the entities of the document in progress are held.
+def extract_entities(nlp, documents, batch_size=64, n_process=1, max_chunk_chars=DEFAULT_CHUNK_CHARS):
+    chunks = iter_document_chunks(documents, min(max_chunk_chars, nlp.max_length))
+    entities = []
+    for doc, (context, offset, last) in nlp.pipe(chunks, as_tuples=True, batch_size=batch_size, n_process=n_process):
+        entities.extend({"text": ent.text, "label": ent.label_,
+                         "start": ent.start_char + offset, "end": ent.end_char + offset} for ent in doc.ents)
+        if last:
+            yield {"id": context["id"], "entities": entities}
+            entities = []
+
+# Function to write records as JSON lines, flushing each one so output is usable while the run continues.
+# Returns (documents, entities) written.
+def write_jsonl(records, f):
+    documents = entities = 0
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        f.flush()
+        documents += 1
+        entities += len(record["entities"])
+    return documents, entities
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract named entities from many documents with spaCy")
+    parser.add_argument('input', help="a file of URLs (one per line) or a .jsonl file of {\"id\", \"text\"} records")
+    parser.add_argument('-o', '--output', help="JSONL output file (default: stdout)")
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--n-process', type=int, default=1, help="worker processes for nlp.pipe")
+    parser.add_argument('--max-chunk-chars', type=int, default=DEFAULT_CHUNK_CHARS,
+                        help="longest text passed to the model at once")
+    parser.add_argument('--fetch-workers', type=int, default=8, help="concurrent page downloads")
+    parser.add_argument('--index', help="also add the entities to this SQLite entity index (see entity_index.py)")
+    parser.add_argument('--keep-components', action='store_true', help="load the full pipeline instead of NER only")
+    args = parser.parse_args()
+
+    nlp = load_ner_model(args.model, exclude=[] if args.keep_components else NER_EXCLUDE)
+    if args.input.endswith('.jsonl'):
+        documents = iter_jsonl_documents(args.input)
+    else:
+        documents = iter_url_documents(iter_urls(args.input), workers=args.fetch_workers)
+
+    start = time.perf_counter()
+    records = extract_entities(nlp, documents, batch_size=args.batch_size, n_process=args.n_process,
+                               max_chunk_chars=args.max_chunk_chars)
+    index = EntityIndex(args.index) if args.index else None
+    if index is not None:
+        records = index.indexed(records)
+    try:
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                document_count, entity_count = write_jsonl(records, f)
+        else:
+            document_count, entity_count = write_jsonl(records, sys.stdout)
+    finally:
+        if index is not None:
+            index.close()
+    elapsed = time.perf_counter() - start
+    print(f"{document_count} documents, {entity_count} entities in {elapsed:.1f}s "
+          f"({document_count / elapsed * 3600 if elapsed else 0:.0f} documents/hour)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,35 @@
-import pandas as pd
+import os
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import datetime
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import tkinter.messagebox as messagebox
-from nltk.tokenize import word_tokenize
+from tkinter import filedialog
+from catalog import Catalog, BorrowerLedger
+from library_store import LibraryStore
+from bulk_io import FILE_TYPES, describe_report, import_books, import_borrowers, export_books, export_borrowers
 
 # Download NLTK resources
-nltk.download('punkt')
 nltk.download('vader_lexicon')
 
-# Initialize the books and reviews DataFrames
-books_df = pd.DataFrame(columns=["Title", "Author", "Genre", "Availability"])
+# Initialize the book catalog and reviews
+catalog = Catalog()
 reviews_dict = {}  # Dictionary to hold book titles and associated reviews
 
+# Persistent storage for books, borrowers and reviews (loaded at startup, see the end of the file)
+LIBRARY_DB = os.environ.get('BOOKMASTER_DB', 'bookmaster.sqlite3')
+store = LibraryStore(LIBRARY_DB)
+
 # Function to add a new book
 def add_book(title, author, genre):
-    global books_df
-    new_book = pd.DataFrame({"Title": [title], "Author": [author], "Genre": [genre], "Availability": ["Available"]})
-    books_df = pd.concat([books_df, new_book], ignore_index=True)
+    row_id = catalog.add_book(title, author, genre)
+    if title in reviews_dict:
+        store.clear_reviews(title)
     reviews_dict[title] = []  # Initialize an empty review list for the book
-    update_treeview_books()
+    store.add_book(row_id, title, author, genre)
+    store.flush()
+    update_treeview_books([row_id])
     
     # Clear input fields
     book_title_entry.delete(0, 'end')
@@ -32,30 +40,16 @@ def add_book(title, author, genre):
     messagebox.showinfo("Success", f"Book '{title}' by {author} added successfully!")
 
 # Function to search for books
-def search_books(query):
-    global books_df
-    
-    # Tokenize the query for better search matching
-    query_tokens = word_tokenize(query.lower())
-
-    # Function to tokenize and match against book fields (title, author, genre)
-    def is_match(row):
-        book_title_tokens = word_tokenize(row['Title'].lower())
-        book_author_tokens = word_tokenize(row['Author'].lower())
-        book_genre_tokens = word_tokenize(row['Genre'].lower())
-
-        # Check if any token in the query matches any token in the book fields
-        return any(token in book_title_tokens for token in query_tokens) or \
-               any(token in book_author_tokens for token in query_tokens) or \
-               any(token in book_genre_tokens for token in query_tokens)
-
-    # Apply the search function across the DataFrame
-    results = books_df[books_df.apply(is_match, axis=1)]
+def search_books(query, limit=50):
+    # Rank books whose title, author or genre match the query words (the last word may be partial)
+    row_ids, total = catalog.search(query, limit)
+    results = catalog.to_dataframe(row_ids)
 
     # Display results in a popup
     if not results.empty:
         result_str = results.to_string(index=False)
-        messagebox.showinfo('Search Results', f"Books matching '{query}':\n{result_str}")
+        shown = f" (top {len(row_ids)} of {total})" if total > len(row_ids) else ""
+        messagebox.showinfo('Search Results', f"Books matching '{query}'{shown}:\n{result_str}")
     else:
         messagebox.showinfo('No Results', f"No books found for query: '{query}'")
 
@@ -88,6 +82,8 @@ def add_review(book_title, review):
     # Add the review and sentiment to the dictionary
     if book_title in reviews_dict:
         reviews_dict[book_title].append({"review": review, "sentiment": sentiment})
+        store.add_review(book_title, review, sentiment)
+        store.flush()
     
     messagebox.showinfo("Review Sentiment", f"Review added for {book_title} with a {sentiment} sentiment.")
 
@@ -95,26 +91,22 @@ def add_review(book_title, review):
     review_entry.delete(0, 'end')
 
 # Function to add a borrower
-borrowers_df = pd.DataFrame(columns=["Borrower Name", "Book Title", "Borrow Date", "Due Date"])
+borrowers = BorrowerLedger()
 
 def add_borrower(borrower_name, book_title):
-    global borrowers_df, books_df
-    book_exists = books_df[books_df['Title'] == book_title]
+    availability = catalog.get_availability(book_title)
 
-    if not book_exists.empty:  # If the book exists
-        if books_df.loc[books_df['Title'] == book_title, 'Availability'].values[0] == "Available":
+    if availability is not None:  # If the book exists
+        if availability == "Available":
             borrow_date = datetime.date.today()
             due_date = borrow_date + datetime.timedelta(days=14)  # 2 weeks borrowing period
-            new_borrower = pd.DataFrame({
-                "Borrower Name": [borrower_name],
-                "Book Title": [book_title],
-                "Borrow Date": [borrow_date],
-                "Due Date": [due_date]
-            })
-            borrowers_df = pd.concat([borrowers_df, new_borrower], ignore_index=True)
-            books_df.loc[books_df['Title'] == book_title, 'Availability'] = "Borrowed"
+            borrowers.add_loan(borrower_name, book_title, borrow_date, due_date)
+            catalog.set_availability(book_title, "Borrowed")
+            store.add_loan(borrower_name, book_title, borrow_date, due_date)
+            store.set_availability(catalog.find_title(book_title), "Borrowed")
+            store.flush()
             update_treeview_borrowers()
-            update_treeview_books()
+            update_treeview_books(catalog.find_title(book_title))
             
             # Clear input fields
             borrower_name_entry.delete(0, 'end')
@@ -129,13 +121,13 @@ def add_borrower(borrower_name, book_title):
 
 # Function to return a book
 def return_book(borrower_name, book_title):
-    global borrowers_df, books_df
-    borrowers_df = borrowers_df[
-        ~(borrowers_df['Borrower Name'] == borrower_name) & (borrowers_df['Book Title'] == book_title)
-    ]
-    books_df.loc[books_df['Title'] == book_title, 'Availability'] = "Available"
+    borrowers.remove_loans(borrower_name, book_title)
+    catalog.set_availability(book_title, "Available")
+    store.remove_loans(borrower_name, book_title)
+    store.set_availability(catalog.find_title(book_title), "Available")
+    store.flush()
     update_treeview_borrowers()
-    update_treeview_books()
+    update_treeview_books(catalog.find_title(book_title))
     
     # Clear input fields
     return_borrower_name_entry.delete(0, 'end')
@@ -156,19 +148,52 @@ def on_borrow_book():
     add_borrower(borrower_name_entry.get(), borrow_book_entry.get())
 def on_return_book():
     return_book(return_borrower_name_entry.get(), return_book_title_entry.get())
-
-# Function to update books Treeview
-def update_treeview_books():
-    for i in treeview_books.get_children():
-        treeview_books.delete(i)
-    for idx, row in books_df.iterrows():
-        treeview_books.insert("", "end", values=list(row))
+def on_import_books():
+    bulk_transfer(lambda path: import_books(path, catalog, store, reviews_dict), filedialog.askopenfilename)
+def on_import_borrowers():
+    bulk_transfer(lambda path: import_borrowers(path, catalog, borrowers, store), filedialog.askopenfilename)
+def on_export_books():
+    bulk_transfer(lambda path: export_books(path, catalog), filedialog.asksaveasfilename)
+def on_export_borrowers():
+    bulk_transfer(lambda path: export_borrowers(path, borrowers), filedialog.asksaveasfilename)
+def on_close():
+    store.close()
+    app.destroy()
+
+# Function to run a bulk import or export on a chosen file, refreshing the lists once and showing one summary.
+# The lists are refreshed even when the file fails partway, since earlier chunks are already imported.
+def bulk_transfer(transfer, choose_file):
+    path = choose_file(filetypes=FILE_TYPES)
+    if not path:
+        return
+    try:
+        report = transfer(path)
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Bulk Transfer Failed", str(e))
+        return
+    finally:
+        update_treeview_books()
+        update_treeview_borrowers()
+    messagebox.showinfo("Bulk Transfer", describe_report(report))
+
+# Function to update books Treeview; with row_ids, only those rows are inserted or refreshed
+def update_treeview_books(row_ids=None):
+    if row_ids is None:
+        treeview_books.delete(*treeview_books.get_children())
+        for row_id, row in enumerate(catalog.rows()):
+            treeview_books.insert("", "end", iid=str(row_id), values=list(row))
+        return
+    for row_id in row_ids:
+        if treeview_books.exists(str(row_id)):
+            treeview_books.item(str(row_id), values=list(catalog.row(row_id)))
+        else:
+            treeview_books.insert("", "end", iid=str(row_id), values=list(catalog.row(row_id)))
 
 # Function to update borrowers Treeview
 def update_treeview_borrowers():
     for i in treeview_borrowers.get_children():
         treeview_borrowers.delete(i)
-    for idx, row in borrowers_df.iterrows():
+    for row in borrowers.rows():
         treeview_borrowers.insert("", "end", values=list(row))
 
 # ========================================================== UI Code ==========================================================
@@ -287,6 +312,13 @@ review_entry.grid(row=18, column=1, padx=10, sticky="ew")
 
 ttk.Button(scrollable_frame, text="Analyze Review Sentiment", command=on_analyze_sentiment).grid(row=19, column=1, pady=10, padx=10, sticky="e")
 
+# Bulk Import / Export Section
+ttk.Label(scrollable_frame, text="Bulk Import / Export (CSV, JSONL, Parquet)", bootstyle="success").grid(row=20, column=0, pady=10, padx=10, sticky="w")
+ttk.Button(scrollable_frame, text="Import Books", command=on_import_books).grid(row=21, column=0, pady=5, padx=10, sticky="w")
+ttk.Button(scrollable_frame, text="Import Borrowers", command=on_import_borrowers).grid(row=21, column=1, pady=5, padx=10, sticky="w")
+ttk.Button(scrollable_frame, text="Export Books", command=on_export_books).grid(row=22, column=0, pady=5, padx=10, sticky="w")
+ttk.Button(scrollable_frame, text="Export Borrowers", command=on_export_borrowers).grid(row=22, column=1, pady=5, padx=10, sticky="w")
+
 # Tab 2: Book and Borrower Lists
 frame_lists = ttk.Frame(notebook)
 notebook.add(frame_lists, text="Book & Borrower Lists")
@@ -315,5 +347,11 @@ treeview_borrowers.grid(row=3, column=0, padx=10, pady=10, sticky="nsew")
 scrollable_frame.columnconfigure(1, weight=1)
 frame_lists.columnconfigure(0, weight=1)
 
+# Load the saved library and write any pending changes when the window closes
+store.load(catalog, borrowers, reviews_dict)
+update_treeview_books()
+update_treeview_borrowers()
+app.protocol("WM_DELETE_WINDOW", on_close)
+
 # Run the app
 app.mainloop()
\ No newline at end of file
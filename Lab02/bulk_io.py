@@ -0,0 +1,272 @@
+# Bulk import and export of books and borrowers as CSV, JSONL or Parquet (Parquet needs pyarrow).
+# Records are read and written in chunks, validated, and added straight to the catalog and store without
+# touching the UI; the caller refreshes the views once at the end.
+# Usage: python bulk_io.py import books catalog.csv [--skip-existing]
+#        python bulk_io.py import borrowers loans.jsonl
+#        python bulk_io.py export books books.parquet
+import argparse
+import datetime
+import json
+import os
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+from catalog import BOOK_COLUMNS, BORROWER_COLUMNS, Catalog, BorrowerLedger
+from library_store import LibraryStore
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+FILE_TYPES = [("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Parquet", "*.parquet"), ("All files", "*.*")]
+AVAILABILITY_VALUES = {"available": "Available", "borrowed": "Borrowed"}
+MAX_REPORTED_ERRORS = 20
+
+# Outcome of an import: records read, imported, skipped as duplicates, rejected, the first few error
+# messages and the elapsed time
+ImportReport = namedtuple('ImportReport', ['records', 'imported', 'skipped', 'rejected', 'errors', 'seconds'])
+ExportReport = namedtuple('ExportReport', ['records', 'seconds'])
+# Stand-in for a JSONL line that could not be decoded, so the import can reject it and carry on
+InvalidRecord = namedtuple('InvalidRecord', ['error'])
+
+# Function to describe a report in one line, with throughput
+def describe_report(report):
+    rate = report.records / report.seconds if report.seconds else 0
+    if isinstance(report, ExportReport):
+        return f"Exported {report.records} records in {report.seconds:.2f}s ({rate:,.0f} records/s)."
+    message = (f"Read {report.records} records in {report.seconds:.2f}s ({rate:,.0f} records/s): "
+               f"{report.imported} imported, {report.skipped} skipped, {report.rejected} rejected.")
+    if report.errors:
+        message += "\n" + "\n".join(report.errors)
+    return message
+
+# Function to pick the file format from the file extension
+def file_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file type '{extension}'; use one of {', '.join(FORMATS)}")
+    return FORMATS[extension]
+
+def import_pyarrow_parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("Parquet files need the pyarrow package (pip install pyarrow)") from None
+    return pyarrow, pyarrow.parquet
+
+# Function to read a file as chunks of records (lists of dicts with the file's own column names)
+def read_chunks(path, chunk_size=10000):
+    kind = file_format(path)
+    if kind == 'csv':
+        for frame in pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+            yield frame.to_dict('records')
+    elif kind == 'jsonl':
+        chunk = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        chunk.append(json.loads(line))
+                    except ValueError as e:
+                        chunk.append(InvalidRecord(f"invalid JSON ({e})"))
+                    if len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
+        if chunk:
+            yield chunk
+    else:
+        pyarrow, parquet = import_pyarrow_parquet()
+        for batch in parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+
+# Function to write chunks of rows (tuples in `columns` order) to a file; returns the number of rows written
+def write_chunks(path, columns, chunks):
+    kind = file_format(path)
+    count = 0
+    if kind == 'parquet':
+        pyarrow, parquet = import_pyarrow_parquet()
+        schema = pyarrow.schema([(column, pyarrow.string()) for column in columns])
+        with parquet.ParquetWriter(path, schema) as writer:
+            for rows in chunks:
+                writer.write_table(pyarrow.Table.from_pylist([dict(zip(columns, row)) for row in rows], schema=schema))
+                count += len(rows)
+        return count
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if kind == 'csv':
+            header = True
+            for rows in chunks:
+                pd.DataFrame(rows, columns=columns).to_csv(f, header=header, index=False)
+                header = False
+                count += len(rows)
+            if header:
+                pd.DataFrame(columns=columns).to_csv(f, index=False)
+        else:
+            for rows in chunks:
+                f.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n' for row in rows)
+                count += len(rows)
+    return count
+
+# Function to read a field by its column name, also accepting it in lowercase or snake_case ("book_title")
+def field(record, name):
+    for key in (name, name.lower(), name.lower().replace(' ', '_')):
+        if key in record:
+            value = record[key]
+            if value is None or (isinstance(value, float) and value != value):
+                return ""
+            return str(value).strip()
+    return ""
+
+def chunked(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# Function to check that a record can be read field by field; returns the reason it cannot, or None
+def record_error(record):
+    if isinstance(record, InvalidRecord):
+        return record.error
+    if not isinstance(record, dict):
+        return f"expected an object, got {type(record).__name__}"
+    return None
+
+# Running totals of an import
+class ImportCounter:
+    def __init__(self):
+        self.records = self.imported = self.skipped = self.rejected = 0
+        self.errors = []
+        self.start = time.perf_counter()
+
+    def reject(self, message):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Record {self.records}: {message}")
+
+    def report(self):
+        return ImportReport(self.records, self.imported, self.skipped, self.rejected, self.errors,
+                            time.perf_counter() - self.start)
+
+# Function to import books. Each record needs a Title and Author; Genre is optional and Availability
+# defaults to "Available". With skip_existing, titles already in the catalog are skipped.
+def import_books(path, catalog, store, reviews_dict, chunk_size=10000, skip_existing=False):
+    counter = ImportCounter()
+    for chunk in read_chunks(path, chunk_size):
+        for record in chunk:
+            counter.records += 1
+            error = record_error(record)
+            if error:
+                counter.reject(error)
+                continue
+            title = field(record, "Title")
+            author = field(record, "Author")
+            availability = field(record, "Availability") or "Available"
+            if not title or not author:
+                counter.reject("Title and Author are required")
+                continue
+            if availability.lower() not in AVAILABILITY_VALUES:
+                counter.reject(f"unknown availability '{availability}'")
+                continue
+            if skip_existing and title in catalog:
+                counter.skipped += 1
+                continue
+            genre = field(record, "Genre")
+            availability = AVAILABILITY_VALUES[availability.lower()]
+            row_id = catalog.add_book(title, author, genre, availability)
+            store.add_book(row_id, title, author, genre, availability)
+            reviews_dict.setdefault(title, [])
+            counter.imported += 1
+        store.flush()
+    return counter.report()
+
+# Function to parse an ISO date field, or return `default` when it is empty
+def parse_date(value, default=None):
+    if not value:
+        return default
+    return datetime.date.fromisoformat(value[:10])
+
+# Function to import loans. Each record needs a Borrower Name and the Book Title of an available book;
+# Borrow Date defaults to today and Due Date to two weeks after it. Imported books are marked Borrowed.
+def import_borrowers(path, catalog, borrowers, store, chunk_size=10000):
+    counter = ImportCounter()
+    today = datetime.date.today()
+    for chunk in read_chunks(path, chunk_size):
+        for record in chunk:
+            counter.records += 1
+            error = record_error(record)
+            if error:
+                counter.reject(error)
+                continue
+            borrower_name = field(record, "Borrower Name")
+            book_title = field(record, "Book Title")
+            if not borrower_name or not book_title:
+                counter.reject("Borrower Name and Book Title are required")
+                continue
+            availability = catalog.get_availability(book_title)
+            if availability is None:
+                counter.reject(f"book '{book_title}' does not exist in the library")
+                continue
+            if availability != "Available":
+                counter.reject(f"'{book_title}' is not available")
+                continue
+            try:
+                borrow_date = parse_date(field(record, "Borrow Date"), today)
+                due_date = parse_date(field(record, "Due Date"), borrow_date + datetime.timedelta(days=14))
+            except ValueError as e:
+                counter.reject(f"bad date ({e})")
+                continue
+            borrowers.add_loan(borrower_name, book_title, borrow_date, due_date)
+            catalog.set_availability(book_title, "Borrowed")
+            store.add_loan(borrower_name, book_title, borrow_date, due_date)
+            store.set_availability(catalog.find_title(book_title), "Borrowed")
+            counter.imported += 1
+        store.flush()
+    return counter.report()
+
+# Function to export the catalog
+def export_books(path, catalog, chunk_size=10000):
+    start = time.perf_counter()
+    count = write_chunks(path, BOOK_COLUMNS, chunked(catalog.rows(), chunk_size))
+    return ExportReport(count, time.perf_counter() - start)
+
+# Function to export the current loans, with dates as ISO strings
+def export_borrowers(path, borrowers, chunk_size=10000):
+    start = time.perf_counter()
+    rows = ((name, title, borrow_date.isoformat(), due_date.isoformat())
+            for name, title, borrow_date, due_date in borrowers.rows())
+    count = write_chunks(path, BORROWER_COLUMNS, chunked(rows, chunk_size))
+    return ExportReport(count, time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import or export Bookmaster books and borrowers")
+    parser.add_argument('action', choices=['import', 'export'])
+    parser.add_argument('kind', choices=['books', 'borrowers'])
+    parser.add_argument('path', help="a .csv, .jsonl or .parquet file")
+    parser.add_argument('--db', default=os.environ.get('BOOKMASTER_DB', 'bookmaster.sqlite3'))
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--skip-existing', action='store_true', help="skip books whose title is already in the catalog")
+    args = parser.parse_args()
+
+    store = LibraryStore(args.db)
+    catalog, borrowers, reviews_dict = Catalog(), BorrowerLedger(), {}
+    try:
+        store.load(catalog, borrowers, reviews_dict)
+        if args.action == 'import' and args.kind == 'books':
+            report = import_books(args.path, catalog, store, reviews_dict, args.chunk_size, args.skip_existing)
+        elif args.action == 'import':
+            report = import_borrowers(args.path, catalog, borrowers, store, args.chunk_size)
+        elif args.kind == 'books':
+            report = export_books(args.path, catalog, args.chunk_size)
+        else:
+            report = export_borrowers(args.path, borrowers, args.chunk_size)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{e}\n")
+    finally:
+        store.close()
+    print(describe_report(report))
+
+if __name__ == "__main__":
+    main()
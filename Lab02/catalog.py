@@ -0,0 +1,147 @@
+import pandas as pd
+
+from search_index import SearchIndex
+
+BOOK_COLUMNS = ["Title", "Author", "Genre", "Availability"]
+BORROWER_COLUMNS = ["Borrower Name", "Book Title", "Borrow Date", "Due Date"]
+
+# Function to build the key used by the author and genre indexes
+def index_key(value):
+    return ' '.join(str(value).split()).lower()
+
+# Book catalog kept as column lists that new books are appended to, with a hash index on title and
+# secondary indexes on author and genre. Rows are addressed by their position (row id) and never move,
+# so lookups and availability updates are O(1) and adding a book never copies the catalog. Full-text search
+# goes through an inverted index that is updated as books are added.
+# A DataFrame view is built on demand and cached until the catalog changes.
+class Catalog:
+    def __init__(self):
+        self.titles = []
+        self.authors = []
+        self.genres = []
+        self.availability = []
+        self.title_index = {}   # title -> [row ids]; a title added twice is two copies of the book
+        self.author_index = {}  # normalized author -> [row ids]
+        self.genre_index = {}   # normalized genre -> [row ids]
+        self.search_index = SearchIndex()
+        self._frame = None
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __contains__(self, title):
+        return title in self.title_index
+
+    # Append a book and index it; returns its row id
+    def add_book(self, title, author, genre, availability="Available"):
+        row_id = len(self.titles)
+        self.titles.append(title)
+        self.authors.append(author)
+        self.genres.append(genre)
+        self.availability.append(availability)
+        self.title_index.setdefault(title, []).append(row_id)
+        self.author_index.setdefault(index_key(author), []).append(row_id)
+        self.genre_index.setdefault(index_key(genre), []).append(row_id)
+        self.search_index.add(row_id, title, author, genre)
+        self._frame = None
+        return row_id
+
+    # Append many (title, author, genre[, availability]) records; returns the number added
+    def add_books(self, records):
+        count = 0
+        for record in records:
+            self.add_book(*record)
+            count += 1
+        return count
+
+    def row(self, row_id):
+        return self.titles[row_id], self.authors[row_id], self.genres[row_id], self.availability[row_id]
+
+    def rows(self, row_ids=None):
+        if row_ids is None:
+            return zip(self.titles, self.authors, self.genres, self.availability)
+        return (self.row(row_id) for row_id in row_ids)
+
+    def find_title(self, title):
+        return self.title_index.get(title, [])
+
+    def find_author(self, author):
+        return self.author_index.get(index_key(author), [])
+
+    def find_genre(self, genre):
+        return self.genre_index.get(index_key(genre), [])
+
+    # Ranked full-text search over title, author and genre; returns ([row ids], number of matching books)
+    def search(self, query, limit=50):
+        return self.search_index.search(query, limit)
+
+    # Availability of a title (of its first copy, as before), or None if the title is not in the catalog
+    def get_availability(self, title):
+        row_ids = self.title_index.get(title)
+        if not row_ids:
+            return None
+        return self.availability[row_ids[0]]
+
+    # Set the availability of every copy of a title; returns False if the title is not in the catalog
+    def set_availability(self, title, availability):
+        row_ids = self.title_index.get(title)
+        if not row_ids:
+            return False
+        for row_id in row_ids:
+            self.availability[row_id] = availability
+        self._frame = None
+        return True
+
+    # DataFrame of the whole catalog, or of the given rows in order
+    def to_dataframe(self, row_ids=None):
+        if row_ids is not None:
+            return pd.DataFrame(list(self.rows(row_ids)), columns=BOOK_COLUMNS)
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                {"Title": self.titles, "Author": self.authors, "Genre": self.genres, "Availability": self.availability},
+                columns=BOOK_COLUMNS)
+        return self._frame.copy(deep=False)
+
+# Borrowing records kept as an append-only list with an index on (borrower, title); returned loans are
+# cleared in place and the list is compacted once most of it is stale
+class BorrowerLedger:
+    def __init__(self):
+        self.records = []
+        self.loan_index = {}  # (borrower name, book title) -> [positions in records]
+        self.active = 0
+        self._frame = None
+
+    def __len__(self):
+        return self.active
+
+    def add_loan(self, borrower_name, book_title, borrow_date, due_date):
+        self.loan_index.setdefault((borrower_name, book_title), []).append(len(self.records))
+        self.records.append((borrower_name, book_title, borrow_date, due_date))
+        self.active += 1
+        self._frame = None
+
+    # Remove the loans of a title by a borrower; returns the number removed
+    def remove_loans(self, borrower_name, book_title):
+        positions = self.loan_index.pop((borrower_name, book_title), [])
+        for position in positions:
+            self.records[position] = None
+        self.active -= len(positions)
+        if positions:
+            self._frame = None
+            if self.active < len(self.records) // 2:
+                self._compact()
+        return len(positions)
+
+    def _compact(self):
+        self.records = [record for record in self.records if record is not None]
+        self.loan_index = {}
+        for position, (borrower_name, book_title, borrow_date, due_date) in enumerate(self.records):
+            self.loan_index.setdefault((borrower_name, book_title), []).append(position)
+
+    def rows(self):
+        return (record for record in self.records if record is not None)
+
+    def to_dataframe(self):
+        if self._frame is None:
+            self._frame = pd.DataFrame(list(self.rows()), columns=BORROWER_COLUMNS)
+        return self._frame.copy(deep=False)
@@ -0,0 +1,110 @@
+import datetime
+import sqlite3
+from itertools import groupby
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    row_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    genre TEXT NOT NULL,
+    availability TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS loans (
+    id INTEGER PRIMARY KEY,
+    borrower_name TEXT NOT NULL,
+    book_title TEXT NOT NULL,
+    borrow_date TEXT NOT NULL,
+    due_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS loans_borrower_title ON loans(borrower_name, book_title);
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    book_title TEXT NOT NULL,
+    review TEXT NOT NULL,
+    sentiment TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reviews_book_title ON reviews(book_title);
+"""
+
+# Persistent library state in SQLite (WAL). Changes are queued and written in one transaction once
+# batch_size of them are pending or when flush() is called, so bulk inserts cost one commit per batch.
+# Books keep the catalog's row ids, so loading them back in order rebuilds the same catalog.
+class LibraryStore:
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []  # (sql, params) in the order the changes happened
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def _queue(self, sql, params):
+        self.pending.append((sql, params))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    # Write all queued changes in one transaction; consecutive changes of the same kind go through executemany
+    def flush(self):
+        if not self.pending:
+            return 0
+        pending, self.pending = self.pending, []
+        with self.connection:
+            for sql, group in groupby(pending, key=lambda change: change[0]):
+                self.connection.executemany(sql, [params for _, params in group])
+        return len(pending)
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def add_book(self, row_id, title, author, genre, availability="Available"):
+        self._queue("INSERT OR REPLACE INTO books (row_id, title, author, genre, availability) VALUES (?, ?, ?, ?, ?)",
+                    (row_id, title, author, genre, availability))
+
+    def set_availability(self, row_ids, availability):
+        for row_id in row_ids:
+            self._queue("UPDATE books SET availability = ? WHERE row_id = ?", (availability, row_id))
+
+    def add_loan(self, borrower_name, book_title, borrow_date, due_date):
+        self._queue("INSERT INTO loans (borrower_name, book_title, borrow_date, due_date) VALUES (?, ?, ?, ?)",
+                    (borrower_name, book_title, borrow_date.isoformat(), due_date.isoformat()))
+
+    def remove_loans(self, borrower_name, book_title):
+        self._queue("DELETE FROM loans WHERE borrower_name = ? AND book_title = ?", (borrower_name, book_title))
+
+    def add_review(self, book_title, review, sentiment):
+        self._queue("INSERT INTO reviews (book_title, review, sentiment) VALUES (?, ?, ?)", (book_title, review, sentiment))
+
+    def clear_reviews(self, book_title):
+        self._queue("DELETE FROM reviews WHERE book_title = ?", (book_title,))
+
+    # Load the saved state into an empty catalog, borrower ledger and reviews dictionary;
+    # returns (books, loans, reviews) loaded
+    def load(self, catalog, borrowers, reviews_dict):
+        self.flush()
+        connection = self.connection
+        books = 0
+        for row_id, title, author, genre, availability in connection.execute(
+                "SELECT row_id, title, author, genre, availability FROM books ORDER BY row_id"):
+            if catalog.add_book(title, author, genre, availability) != row_id:
+                raise ValueError(f"{self.path}: book row ids are not contiguous at row {row_id}")
+            reviews_dict[title] = []
+            books += 1
+
+        loans = 0
+        for borrower_name, book_title, borrow_date, due_date in connection.execute(
+                "SELECT borrower_name, book_title, borrow_date, due_date FROM loans ORDER BY id"):
+            borrowers.add_loan(borrower_name, book_title,
+                               datetime.date.fromisoformat(borrow_date), datetime.date.fromisoformat(due_date))
+            loans += 1
+
+        reviews = 0
+        for book_title, review, sentiment in connection.execute(
+                "SELECT book_title, review, sentiment FROM reviews ORDER BY id"):
+            if book_title in reviews_dict:
+                reviews_dict[book_title].append({"review": review, "sentiment": sentiment})
+                reviews += 1
+        return books, loans, reviews
@@ -0,0 +1,182 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+
+TOKEN = re.compile(r'\w+')
+
+# Field weights: a query word in the title counts more than the same word in the author or genre
+FIELD_WEIGHTS = {"title": 2.0, "author": 1.5, "genre": 1.0}
+
+# Function to tokenize text for indexing and queries
+def tokenize(text):
+    return TOKEN.findall(str(text).lower())
+
+# Token inverted index over Title/Author/Genre with BM25 ranking.
+# postings maps each term to {row id: field-weighted term frequency}; terms are also kept in a sorted list so
+# the last query word can match as a prefix while the user is still typing it. New terms are collected
+# unsorted and merged into that list on the next prefix lookup, which keeps bulk loads linear.
+# Each term's postings are also grouped by (term frequency, document length). Every book in a group gets the
+# same BM25 score for that term, so a query can walk the books of a term best-first and stop early (see search).
+class SearchIndex:
+    def __init__(self, k1=1.2, b=0.75, field_weights=FIELD_WEIGHTS):
+        self.k1 = k1
+        self.b = b
+        self.field_weights = field_weights
+        self.postings = {}
+        self.groups = {}       # term -> {(term frequency, document length): [row ids]}
+        self.terms = []        # sorted vocabulary for prefix lookups
+        self.new_terms = []    # terms added since the vocabulary was last sorted
+        self.doc_lengths = {}  # row id -> number of tokens
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    # Index a book under its row id
+    def add(self, row_id, title, author, genre):
+        frequencies = {}
+        length = 0
+        for field, value in (("title", title), ("author", author), ("genre", genre)):
+            weight = self.field_weights[field]
+            for token in tokenize(value):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+                length += 1
+        for token, frequency in frequencies.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                self.groups[token] = {}
+                self.new_terms.append(token)
+            postings[row_id] = frequency
+            self.groups[token].setdefault((frequency, length), []).append(row_id)
+        self.doc_lengths[row_id] = length
+        self.total_length += length
+
+    # Indexed terms starting with prefix, most frequent first
+    def expand_prefix(self, prefix, max_expansions=50):
+        if self.new_terms:
+            self.terms += self.new_terms
+            self.terms.sort()
+            self.new_terms = []
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + '\U0010ffff', start)
+        if end - start <= max_expansions:
+            return self.terms[start:end]
+        return heapq.nlargest(max_expansions, self.terms[start:end], key=lambda term: len(self.postings[term]))
+
+    # A term's postings groups as [(BM25 score, (term frequency, document length), row ids)], best first,
+    # under the current average length
+    def _ranked_groups(self, term, idf, average_length):
+        k1, b = self.k1, self.b
+        return sorted(
+            ((idf * frequency * (k1 + 1) / (frequency + k1 * (1 - b + b * length / average_length)),
+              (frequency, length), row_ids)
+             for (frequency, length), row_ids in self.groups[term].items()),
+            key=lambda group: group[0], reverse=True)
+
+    # Rank books matching any query word. With prefix=True the last word also matches longer terms that
+    # start with it (at half weight). Returns ([row ids, best first], number of matching books).
+    # Top-k uses the threshold algorithm over the grouped postings: the terms are read best group first, in
+    # turn, and the walk stops once the k-th best score is at least the sum of the scores of the groups being
+    # read, which bounds every book not yet seen. A book matching a single term scores exactly its group's
+    # score, so those are taken or skipped a whole group at a time; only books matching several terms are
+    # scored one by one.
+    def search(self, query, limit=50, prefix=True, max_expansions=50):
+        tokens = tokenize(query)
+        if not tokens or not self.doc_lengths or limit <= 0:
+            return [], 0
+        weights = {}
+        for token in tokens:
+            weights[token] = 1.0
+        if prefix:
+            for term in self.expand_prefix(tokens[-1], max_expansions):
+                weights.setdefault(term, 0.5)
+
+        count = len(self.doc_lengths)
+        average_length = self.total_length / count or 1
+        k1, b = self.k1, self.b
+        doc_lengths = self.doc_lengths
+        terms = []  # (term, postings, weighted idf)
+        for term, weight in weights.items():
+            postings = self.postings.get(term)
+            if postings:
+                terms.append((term, postings,
+                              math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)) * weight))
+        if not terms:
+            return [], 0
+        shared, total = self._overlap([postings for term, postings, idf in terms])
+
+        def full_score(row_id):
+            norm = k1 * (1 - b + b * doc_lengths[row_id] / average_length)
+            score = 0.0
+            for term, postings, idf in terms:
+                frequency = postings.get(row_id)
+                if frequency:
+                    score += idf * frequency * (k1 + 1) / (frequency + norm)
+            return score
+
+        best = []  # min-heap of (score, -row id) holding the top `limit`
+
+        def offer(score, row_id):
+            entry = (score, -row_id)
+            if len(best) < limit:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+            else:
+                return False
+            return True
+
+        groups = [self._ranked_groups(term, idf, average_length) for term, postings, idf in terms]
+        next_group = [0] * len(groups)
+        pending = [None] * len(groups)  # iterator over the current group's books that match several terms
+        bounds = [ranked[0][0] for ranked in groups]
+        seen = set()
+        while any(bounds):
+            for i, ranked in enumerate(groups):
+                if not bounds[i]:
+                    continue
+                if pending[i] is None:
+                    score, (frequency, length), row_ids = ranked[next_group[i]]
+                    if not shared:
+                        overlap = ()
+                    elif len(shared) < len(row_ids):
+                        postings = terms[i][1]
+                        overlap = {row_id for row_id in shared
+                                   if postings.get(row_id) == frequency and doc_lengths[row_id] == length}
+                    else:
+                        overlap = shared.intersection(row_ids)
+                    if len(best) < limit or (score, -row_ids[0]) > best[0]:
+                        for row_id in row_ids:
+                            if row_id not in overlap and not offer(score, row_id):
+                                break
+                    pending[i] = iter(sorted(overlap))
+                row_id = next(pending[i], None)
+                if row_id is None:
+                    pending[i] = None
+                    next_group[i] += 1
+                    bounds[i] = ranked[next_group[i]][0] if next_group[i] < len(ranked) else 0.0
+                elif row_id not in seen:
+                    seen.add(row_id)
+                    offer(full_score(row_id), row_id)
+            if len(best) == limit and best[0][0] >= sum(bounds):
+                break
+
+        best.sort(reverse=True)
+        return [-negative_row_id for score, negative_row_id in best], total
+
+    # Books matching more than one of the postings lists, and the number of books matching any of them.
+    # Set operations against the largest list keep this proportional to the smaller lists.
+    def _overlap(self, postings_lists):
+        largest = max(postings_lists, key=len)
+        others = set()
+        shared = set()
+        for postings in postings_lists:
+            if postings is not largest:
+                if others:
+                    shared.update(others.intersection(postings))
+                others.update(postings)
+        outside = others.difference(largest)
+        shared.update(others.difference(outside))
+        return shared, len(largest) + len(outside)